@@ -0,0 +1,86 @@
+# -*- coding:Utf-8 -*-
+
+import threading
+
+import pygame
+
+from Scripts.logger import logger
+
+
+class AssetManager:
+
+    def __init__(self):
+        self.surfaces = dict()  # (chemin, mode) -> surface convertie
+        self.fonts = dict()  # (chemin, taille) -> police
+        self.references = dict()
+        self.decoded = dict()  # chemin -> surface decodee par preload, pas encore convertie
+        self.lock = threading.Lock()
+
+    def load(self, path, mode='convert'):
+        key = (path, mode)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            with self.lock:
+                raw = self.decoded.pop(path, None)
+            if raw is None:
+                raw = pygame.image.load(path)
+            # la conversion a besoin de la fenetre, elle reste sur le thread principal
+            surface = raw.convert_alpha() if mode == 'convert_alpha' else raw.convert()
+            with self.lock:
+                self.surfaces[key] = surface
+                # preload a pu decoder la meme image pendant ce temps, elle ne servira plus
+                self.decoded.pop(path, None)
+        self.references[key] = self.references.get(key, 0) + 1
+        return surface
+
+    def font(self, path, size):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.Font(path, size)
+        self.references[key] = self.references.get(key, 0) + 1
+        return font
+
+    def release(self, path, mode='convert'):
+        key = (path, mode)
+        count = self.references.get(key, 0) - 1
+        if count > 0:
+            self.references[key] = count
+            return
+        self.references.pop(key, None)
+        self.surfaces.pop(key, None)
+        self.fonts.pop(key, None)
+
+    def release_font(self, path, size):
+        self.release(path, size)
+
+    def preload(self, paths, callback=None):
+        thread = threading.Thread(target=self._preload, args=(tuple(paths), callback), daemon=True)
+        thread.start()
+        return thread
+
+    def _preload(self, paths, callback):
+        for i, path in enumerate(paths):
+            self.decode(path)
+            if callback is not None:
+                callback(i + 1, len(paths))
+
+    def decode(self, path):
+        # lecture du disque et decodage de l'image, peut etre appele depuis un autre thread
+        if self._is_decoded(path):
+            return
+        try:
+            raw = pygame.image.load(path)
+        except (pygame.error, OSError) as e:
+            logger.warning('could not preload "{}": {}'.format(path, e))
+        else:
+            with self.lock:
+                # load a pu convertir l'image pendant le decodage
+                if not self._is_decoded(path):
+                    self.decoded[path] = raw
+
+    def _is_decoded(self, path):
+        return path in self.decoded or (path, 'convert') in self.surfaces or (path, 'convert_alpha') in self.surfaces
+
+
+assets = AssetManager()
@@ -1,56 +1,190 @@
 # -*- coding:Utf-8 -*-
 
+import time
+
 import pygame
-from pygame.constants import MOUSEBUTTONDOWN, QUIT
+from pygame.constants import (ACTIVEEVENT, MOUSEBUTTONDOWN, NOEVENT, QUIT, VIDEOEXPOSE, WINDOWEXPOSED,
+                              WINDOWFOCUSGAINED, WINDOWRESTORED, WINDOWSHOWN, WINDOWSIZECHANGED)
+
+from Classes.events import EventTable, coalesce_mouse_motion
 
 pygame.init()
 
+PACING_MODES = ('sleep', 'busy', 'adaptive')
+IDLE_TIMEOUT = 1000  # ms, une page au repos est tout de meme mise a jour de temps en temps
+# la fenetre a ete recouverte, cachee ou redimensionnee : son contenu doit etre entierement reaffiche
+REPAINT_EVENTS = frozenset((ACTIVEEVENT, VIDEOEXPOSE, WINDOWEXPOSED, WINDOWFOCUSGAINED, WINDOWRESTORED, WINDOWSHOWN,
+                            WINDOWSIZECHANGED))
+
 
 class BaseViewer:
 
-    def __init__(self, framerate, logger):
+    def __init__(self, framerate, logger, pacing='sleep', unfocused_framerate=10):
         self.logger = logger
         self.logger.debug('initialize BaseViewer')
+        if pacing not in PACING_MODES:
+            raise ValueError('unknown frame pacing "{}"'.format(pacing))
+        self.pacing = pacing
+        self.unfocused_framerate = unfocused_framerate
+        self.pending_events = list()  # evenements recus pendant l'attente d'une page au repos
         self.stop_mainloop = False
-        self.events = dict()
+        # MOUSEBUTTONDOWN sans fonction affiche les fps
+        self.events = EventTable(REPAINT_EVENTS.union((QUIT, MOUSEBUTTONDOWN)))
         self.actions = set()
         self.FRAMERATE = framerate
         self.clock = pygame.time.Clock()
+        self.frame_time = 0  # duree reelle de la derniere frame en ms
+        self.frame_index = 0
+        self.fixed_frame_time = None  # duree imposee a chaque frame pour rendre une partie reproductible
+        self.recorder = None
+        self.replay = None
+        self.profiler = None  # FrameProfiler, la boucle n'est chronometree que s'il y en a un
 
         self.window = None
 
     def wdisplay(self, window_size, flags=tuple()):
         self.window = pygame.display.set_mode(window_size, *flags)
+        self.events.apply()
 
     def stop_loop(self):
         self.logger.info('Stopping loop...')
         self.stop_mainloop = True
 
-    def loop(self):
-        while not self.stop_mainloop:
+    def tick(self):
+        if self.fixed_frame_time is not None:
+            # partie enregistree ou rejouee : une frame par tour de boucle, sans attente d'evenement
             self.clock.tick(self.FRAMERATE)
-            for event in pygame.event.get():
+            return self.fixed_frame_time
+
+        if self.pacing == 'busy':
+            return self.clock.tick_busy_loop(self.FRAMERATE)
+        if self.pacing == 'sleep':
+            return self.clock.tick(self.FRAMERATE)
+
+        if self.is_idle():
+            # rien a redessiner : le thread dort jusqu'au prochain evenement
+            event = pygame.event.wait(IDLE_TIMEOUT)
+            if event.type != NOEVENT:
+                self.pending_events.append(event)
+            return self.clock.tick()
+        if not pygame.key.get_focused():
+            return self.clock.tick(self.unfocused_framerate)
+        if self.needs_precise_pacing():
+            return self.clock.tick_busy_loop(self.FRAMERATE)
+        return self.clock.tick(self.FRAMERATE)
+
+    def is_idle(self):
+        return False
+
+    def needs_precise_pacing(self):
+        return False
+
+    def repaint(self):
+        pass
+
+    def record(self, recorder):
+        self.recorder = recorder
+        self.fixed_frame_time = 1000 / self.FRAMERATE
+
+    def play_back(self, replay):
+        self.replay = replay
+        self.fixed_frame_time = 1000 / replay.framerate
+
+    def get_events(self):
+        events = pygame.event.get()
+        if self.pending_events:
+            events = self.pending_events + events
+            self.pending_events = list()
+        events = coalesce_mouse_motion(events)
+        if self.replay is not None:
+            # seule la fermeture de la fenetre est encore lue en direct
+            events = [event for event in events if event.type == QUIT] + self.replay.events(self.frame_index)
+            if self.frame_index + 1 >= self.replay.frames:
+                self.stop_loop()
+        if self.recorder is not None:
+            self.recorder.record(self.frame_index, events)
+        return events
+
+    def present(self, rects):
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
 
-                if event.type in self.events.keys():
-                    self.events[event.type](event)
+    def dispatch(self, events):
+        # pygame.event.get a deja pompe les evenements de SDL
+        handlers = self.events.handlers
+        for event in events:
+            handler = handlers[event.type]
 
-                elif event.type == QUIT:
-                    self.logger.warning('The game has been force-quited.')
-                    return -1
+            if handler is not None:
+                handler(event)
 
-                elif event.type == MOUSEBUTTONDOWN:
-                    self.logger.debug(str(self.clock.get_fps()))
-            pygame.event.pump()
+            elif event.type == QUIT:
+                self.logger.warning('The game has been force-quited.')
+                return False
 
-            for action in self.actions:
-                action()
+            elif event.type in REPAINT_EVENTS:
+                self.repaint()
 
-            self.main()
+            elif event.type == MOUSEBUTTONDOWN:
+                self.logger.debug(str(self.clock.get_fps()))
+        return True
 
-            pygame.display.flip()
+    def loop(self):
+        if self.profiler is not None:
+            return self.profiled_loop()
+
+        while not self.stop_mainloop:
+            self.frame_time = self.tick()
+            if not self.dispatch(self.get_events()):
+                return -1
+
+            for action in tuple(self.actions):  # une action peut en ajouter ou en retirer
+                action()
+
+            self.present(self.main())
+            self.frame_index += 1
 
         self.logger.info('Done.')
         return 0
 
+    def profiled_loop(self):
+        # meme boucle que loop, chaque phase de chaque frame est chronometree
+        profiler = self.profiler
+        clock = time.perf_counter
+        try:
+            while not self.stop_mainloop:
+                profiler.begin(self.frame_index)
+                t1 = clock()
+                self.frame_time = self.tick()
+                t2 = clock()
+                profiler.add('tick', t2 - t1)
+                running = self.dispatch(self.get_events())
+                t1 = clock()
+                profiler.add('events', t1 - t2)
+                if not running:
+                    return -1
+
+                for action in tuple(self.actions):
+                    action()
+                    t2 = clock()
+                    profiler.add(profiler.action_name(action), t2 - t1)
+                    t1 = t2
+
+                rects = self.main()
+                t2 = clock()
+                profiler.add('main', t2 - t1)
+                self.present(rects)
+                profiler.add('present', clock() - t2)
+                self.frame_index += 1
+
+            self.logger.info('Done.')
+            return 0
+        finally:
+            self.logger.info(profiler.report())
+            if profiler.path is not None:
+                self.logger.info('frame profile saved in "{}"'.format(profiler.dump()))
+
     def main(self):
         raise NotImplementedError('Implement this method in subclasses of this class.')
@@ -0,0 +1,37 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+from pygame import Rect
+
+
+class Camera:
+
+    def __init__(self, area, index, smoothing=1.):
+        self.area = Rect(area)
+        self.index = index
+        self.smoothing = smoothing  # 1 suit la cible rigidement, plus petit la suit avec du retard
+
+        self.offset = np.zeros(2, dtype=np.int32)  # decalage additionnel dans la conversion pymunk <-> pygame
+        self.position = 0.
+        self.target = None
+
+    def target_position(self):
+        return -self.target.position[0] + self.area.width / 2
+
+    def follow(self, body, snap=True):
+        self.target = body
+        if snap:
+            self.position = self.target_position()
+            self.offset[0] = round(self.position)
+
+    def update(self):
+        if self.target is None:
+            return
+        self.position += (self.target_position() - self.position) * self.smoothing
+        self.offset[0] = round(self.position)
+
+    def view_rect(self):
+        return self.area.move(-int(self.offset[0]), -int(self.offset[1]))
+
+    def visible(self):
+        return self.index.query_rect(self.view_rect())
@@ -0,0 +1,90 @@
+# -*- coding:Utf-8 -*-
+
+from collections import OrderedDict
+
+import pygame
+from pygame import Rect
+
+
+class ChunkCache:
+    # le fond et les structures du niveau sont pre-rendus dans des bandes verticales de chunk_width pixels
+
+    def __init__(self, bg, index, structures, height, chunk_width=512, max_bytes=64 * 2 ** 20, prefetch=1):
+        self.bg = bg
+        self.index = index
+        self.structures = structures
+        self.height = height
+        self.chunk_width = chunk_width
+        self.max_bytes = max_bytes
+        self.prefetch = prefetch
+
+        self.chunks = OrderedDict()
+        self.bytes = 0
+
+    def chunk_range(self, rect):
+        return rect.left // self.chunk_width, (rect.right - 1) // self.chunk_width
+
+    def chunk_rect(self, i):
+        return Rect(i * self.chunk_width, 0, self.chunk_width, self.height)
+
+    def build(self, i):
+        rect = self.chunk_rect(i)
+        surface = pygame.Surface(rect.size).convert()
+
+        # le fond est repete horizontalement
+        bg_width = self.bg.get_width()
+        x = 0
+        while x < rect.width:
+            source_x = (rect.x + x) % bg_width
+            width = min(bg_width - source_x, rect.width - x)
+            surface.blit(self.bg, (x, 0), (source_x, 0, width, rect.height))
+            x += width
+
+        for structure_id in self.index.query_rect(rect):
+            sprite = self.structures[structure_id]
+            surface.blit(sprite.image, sprite.world_rect.move(-rect.x, 0))
+
+        self.chunks[i] = surface
+        self.bytes += surface.get_bytesize() * rect.width * rect.height
+        return surface
+
+    def get(self, i):
+        try:
+            surface = self.chunks[i]
+        except KeyError:
+            return self.build(i)
+        self.chunks.move_to_end(i)
+        return surface
+
+    def evict(self, keep):
+        while self.bytes > self.max_bytes and len(self.chunks) > keep:
+            _, surface = self.chunks.popitem(last=False)
+            self.bytes -= surface.get_bytesize() * surface.get_width() * surface.get_height()
+
+    def invalidate(self, rect):
+        first, last = self.chunk_range(rect)
+        for i in range(first, last + 1):
+            surface = self.chunks.pop(i, None)
+            if surface is not None:
+                self.bytes -= surface.get_bytesize() * surface.get_width() * surface.get_height()
+
+    def clear(self):
+        self.chunks.clear()
+        self.bytes = 0
+
+    def draw(self, window, camera):
+        first, last = self.chunk_range(camera.view_rect())
+        ox, oy = int(camera.offset[0]), int(camera.offset[1])
+        for i in range(first, last + 1):
+            window.blit(self.get(i), (i * self.chunk_width + ox, oy))
+
+        # un seul chunk proche de la vue est construit par frame pour lisser le cout
+        for i in range(1, self.prefetch + 1):
+            if last + i not in self.chunks:
+                self.build(last + i)
+                break
+            if first - i not in self.chunks:
+                self.build(first - i)
+                break
+
+        self.evict(last - first + 1 + 2 * self.prefetch)
@@ -4,18 +4,24 @@ from math import cos, sin
 import math
 
 import numpy as np
-import pymunk
 from pygame.locals import *
 from pymunk.vec2d import Vec2d
-import pymunk.pygame_util
 
+import pygame
 import pygame.key
 
+from Classes.debug_overlay import DebugOverlay
+from Classes.geometry import merge_segments
 from Classes.handlers import BaseActionHandler, BaseEventHandler
+from Classes.level_loader import LevelLoader
 from Classes.my_queue import DequeQueue as Queue
 from Classes.my_queue import Empty
 from Classes.ordered_set import OrderedSet
 from Classes.page_handler import PageHandler
+from Classes.physics import LevelMetrics, SpaceFactory
+from Classes.scheduler import FixedTimestep
+from Classes.streaming import LevelStreamer
+from Scripts.configurations import ig_cfg
 from Scripts.logger import logger
 
 from sprites.sprites import Structure
@@ -28,10 +34,40 @@ class Controller:
         self.model = model
         self.viewer = viewer
         self.page_handler = self.ControllerPageHandler()
+        self.loader = None
 
     def _play(self):  # callback pour StartingPage
-        self.viewer.play()
-        self.page_handler.switch_page('InGame', self.model, self.viewer, 1)
+        self.viewer.show_loading()
+        image_paths = (path for path, mode in self.viewer.page_handler.InGame.ASSETS)
+        self.loader = LevelLoader(1, image_paths, self.model.database_path).start()
+        self.viewer.actions.add(self._wait_level)
+
+    def _wait_level(self):  # appele a chaque frame pendant le chargement
+        if self.viewer.fixed_frame_time is not None:
+            # partie enregistree ou rejouee : le niveau doit etre pret a la meme frame a chaque fois
+            self.loader.thread.join()
+        done = self.loader.done
+        for step, total in self.loader.poll():
+            self.viewer.page_handler.current_page.set_progress(step / total)
+        if not done:
+            return
+
+        self.viewer.actions.discard(self._wait_level)
+        loader, self.loader = self.loader, None
+        if loader.error is not None:
+            return self._load_failed(loader.level_id, loader.error)
+        try:
+            self.viewer.play(loader.level_id)
+            self.page_handler.switch_page('InGame', self.model, self.viewer, loader.level_id, loader)
+        except (pygame.error, OSError) as error:
+            # une image du niveau manque ou ne peut pas etre decodee
+            self._load_failed(loader.level_id, error)
+
+    def _load_failed(self, level_id, error):
+        # le jeu revient au menu au lieu de s'arreter sur une exception dans la boucle
+        logger.error('level {} could not be loaded: {!r}'.format(level_id, error))
+        self.viewer.show_menu()
+        self.page_handler.switch_page('StartingPage', self.model, self.viewer, self._play)
 
     def init_pages(self):
         if self.viewer.page_handler.current_page is None:
@@ -90,11 +126,16 @@ class Controller:
                     self.do_play = play_callback
 
         class InGame(_ControllerPage):
-            def __init__(self, model, viewer, level_id):
+            def __init__(self, model, viewer, level_id, loader=None):
                 super().__init__(model, viewer)
                 self.level_id = int(level_id)
-                self.structure_getter = self.model.structure_getter(self.level_id)
-                self.level = tuple(self.model.get_level(self.level_id))[0]
+                if loader is None:
+                    self.structure_getter = self.model.structure_getter(self.level_id)
+                    self.level = tuple(self.model.get_level(self.level_id))[0]
+                else:
+                    # le niveau a deja ete lu par un LevelLoader
+                    self.structure_getter = loader.structure_getter
+                    self.level = loader.level
                 self.viewer_page = None
                 self.player_coords = np.array(self.level[1:3], dtype=np.int64)
 
@@ -107,30 +148,50 @@ class Controller:
 
 
                 self.gravity = (0, -1000)
-                self.space = self.init_pymunk_space(self.gravity)
+                self.space_factory = SpaceFactory.from_config(ig_cfg, self.gravity)
+                self.space = None
 
                 self.mods = None
                 self.v = None
 
                 self.player = None
-
-                self.spups = 5  # number of space updates per second
-                self.dt = 1. / self.viewer.FRAMERATE / self.spups
-
-            @staticmethod
-            def init_pymunk_space(gravity):
-                space = pymunk.Space()
-                space.gravity = gravity
-
-                return space
+                self.player_force = Vec2d(0, 0)
+
+                self.dt = 1. / ig_cfg.getint('physics_rate')
+                self.steps = 0
+                self.scheduler = FixedTimestep(self.dt, ig_cfg.getint('max_physics_steps'))
+
+                self.merge_segments = ig_cfg.getboolean('merge_segments')
+                self.shape_structures = dict()  # forme pymunk -> ids des structures qu'elle couvre
+
+                self.streamer = None
+                if ig_cfg.getboolean('streaming'):
+                    self.streamer = LevelStreamer(self.structure_getter, self.load_chunk, self.unload_chunk,
+                                                  ig_cfg.getint('streaming_chunk_width'),
+                                                  ig_cfg.getint('streaming_load_radius'),
+                                                  ig_cfg.getint('streaming_unload_radius'))
+
+            def init_pymunk_space(self):
+                if self.space_factory.broadphase != 'spatial_hash':
+                    return self.space_factory.create()
+                # la table de hachage est dimensionnee d'apres les structures du niveau
+                size = self.viewer_page.load_structure_image().get_size()
+                loaded_width = None
+                if self.streamer is not None:
+                    loaded_width = self.streamer.chunk_width * (2 * self.streamer.unload_radius + 1)
+                metrics = LevelMetrics.from_structures(self.structure_getter,
+                                                       dict.fromkeys(self.structure_getter.labels, size), loaded_width)
+                logger.debug('{}, spatial hash: {}'.format(metrics, self.space_factory.spatial_hash_args(metrics)))
+                return self.space_factory.create(metrics)
 
             def activate(self):
                 logger.debug('play button was pressed')
                 self.viewer_page = self.viewer.page_handler.current_page
-                self.draw_configuration = pymunk.pygame_util.DrawOptions(self.viewer_page.window)
                 self.viewer_page.display_bg(self.level[3])
 
-                self.viewer_page.load_structures(self.structure_getter)
+                if self.streamer is None:
+                    self.viewer_page.index_level(self.structure_getter)
+                    self.viewer_page.load_structures(self.structure_getter)
                 self.viewer_page.load_player(self.player_coords)
 
                 self.player = self.viewer_page.player
@@ -144,18 +205,64 @@ class Controller:
                 self.viewer_page.bind_events(self.event_handler)
                 self.viewer_page.actions.add(self.update)
 
-                self.viewer_page.player.init_body(self.to_pygame, self.from_pygame, 1.3, 40000)
+                self.space = self.init_pymunk_space()
+                transform = self.viewer_page.transform
+                self.player.init_body(transform.to_pygame, transform.from_pygame, transform.place_rect, 1.3, 40000)
                 self.player.add_to_space(self.space)
 
-                sprites = self.viewer_page.structure_group.sprites()
-                for structure in sprites:
-                    structure.init_body(self.to_pygame, self.from_pygame,
-                                        self.from_pygame((structure.rect.right, structure.rect.top)),
-                                        self.from_pygame((structure.rect.left, structure.rect.top)))
-                self.space.add(Structure.body, [s.shape for s in sprites])
+                self.space.add(Structure.body)
+                if self.streamer is None:
+                    self.add_structures(self.viewer_page.structure_group.sprites())
+                else:
+                    self.streamer.update(self.player.body.position.x)
+
+                self.viewer_page.camera.follow(self.player)
+                self.viewer_page.debug_overlay = DebugOverlay(self.space, self.viewer_page.window,
+                                                              self.viewer_page.camera, self.viewer.clock)
+                self.scheduler.reset()
 
             def deactivate(self):
-                pass
+                # le corps statique des structures est partage et ne peut appartenir qu'a un seul espace
+                if self.space is not None and Structure.body.space is self.space:
+                    self.space.remove([shape for shape in self.space.shapes if shape.body is Structure.body])
+                    self.space.remove(Structure.body)
+
+            def add_structures(self, sprites):
+                transform = self.viewer_page.transform
+                segments = [(structure.structure_id, transform.from_world(structure.world_rect.topright),
+                             transform.from_world(structure.world_rect.topleft)) for structure in sprites]
+                if self.merge_segments:
+                    merged = merge_segments(segments)
+                else:
+                    merged = [(a, b, (structure_id,)) for structure_id, a, b in segments]
+
+                structures = {structure.structure_id: structure for structure in sprites}
+                ends = {structure_id: (a, b) for structure_id, a, b in segments}
+                shapes = list()
+                for a, b, ids in merged:
+                    first = structures[ids[0]]
+                    first.init_body(transform.to_pygame, transform.from_pygame, a, b)
+                    for structure_id in ids[1:]:
+                        structures[structure_id].init_body(transform.to_pygame, transform.from_pygame,
+                                                           *ends[structure_id], shape=first.shape)
+                    self.shape_structures[first.shape] = ids
+                    shapes.append(first.shape)
+                self.space.add(shapes)
+                logger.debug('{} structures added as {} shapes'.format(len(segments), len(shapes)))
+
+            def structures_of(self, shape):
+                structures = self.viewer_page.structures
+                return [structures[i] for i in self.shape_structures.get(shape, ()) if i in structures]
+
+            def load_chunk(self, structures):
+                self.add_structures(self.viewer_page.load_structures(structures))
+
+            def unload_chunk(self, structure_ids):
+                # un segment fusionne ne couvre que des structures de la meme bande
+                shapes = dict.fromkeys(s.shape for s in self.viewer_page.unload_structures(structure_ids))
+                for shape in shapes:
+                    del self.shape_structures[shape]
+                self.space.remove(list(shapes))
 
             class EventHandler(BaseEventHandler):
                 def __init__(self, viewer_page, action_handler):
@@ -166,7 +273,8 @@ class Controller:
                         K_SPACE: 'jump',
                         K_ESCAPE: 'quit',
                         K_w: 'tp',
-                        K_i: 'refresh_structures'
+                        K_i: 'refresh_structures',
+                        K_F3: ('toggle_debug_overlay', None)
                     }
 
                 def keydown(self, evt):
@@ -183,7 +291,8 @@ class Controller:
                     except IndexError:
                         return
 
-                    self.action_handler('stop', action_name[1])
+                    if action_name[1] is not None:
+                        self.action_handler('stop', action_name[1])
 
             #
             # class ActionHandler(BaseActionHandler):
@@ -281,17 +390,19 @@ class Controller:
                     self.player.is_moving = False
                     self.player.is_stopping = True
 
+                def do_toggle_debug_overlay(self):
+                    self.viewer_page.debug_overlay.toggle()
+
             def from_pygame(self, d):
-                return self.viewer_page.from_pygame(d)
+                return self.viewer_page.transform.from_pygame(d)
 
             def to_pygame(self, d):
-                return self.viewer_page.to_pygame(d)
+                return self.viewer_page.transform.to_pygame(d)
 
             def move(self, is_mods):
                 modif = is_mods + 1
                 div = math.sqrt(self.v.dot(self.v)) / 4 + 1
-                self.player.body.apply_force_at_local_point(
-                    Vec2d(self.player.VELOCITY / div * self.player.direction / modif * self.spups, 0), (0, 0))
+                self.player_force = Vec2d(self.player.VELOCITY / div * self.player.direction / modif, 0)
 
             def stop(self):
                 if self.player.bf > 30:
@@ -301,12 +412,19 @@ class Controller:
                     self.player.is_stopping = False
                 else:
                     self.player.bf += 1
-                    self.player.body.apply_force_at_local_point(
-                        Vec2d(-self.player.VELOCITY * self.spups / 15 * self.player.direction, 0), (0, 0))
+                    self.player_force = Vec2d(-self.player.VELOCITY / 15 * self.player.direction, 0)
+
+            def step(self):
+                # pymunk remet les forces a zero apres chaque pas, elles sont donc appliquees a chacun
+                self.player.body.apply_force_at_local_point(self.player_force, (0, 0))
+                self.player.previous_position = self.player.body.position
+                self.space.step(self.dt)
+                self.steps += 1
 
             def update(self):
                 self.mods = pygame.key.get_mods()
                 self.v = self.player.body.velocity
+                self.player_force = Vec2d(0, 0)
 
                 if self.player.is_moving:
                     self.move(self.mods & KMOD_LCTRL)
@@ -323,9 +441,10 @@ class Controller:
                     else:
                         print('stumbling')
 
-                for _ in range(self.spups):
-                    self.space.step(self.dt)
+                if self.streamer is not None:
+                    self.streamer.update(self.player.body.position.x)
+
+                for _ in range(self.scheduler.advance(self.viewer.frame_time / 1000)):
+                    self.step()
 
-                self.viewer_page.player_group.update()
-                self.viewer_page.structure_group.update()
-                self.space.debug_draw(self.draw_configuration)
+                self.viewer_page.player_group.update(self.scheduler.alpha)
@@ -0,0 +1,66 @@
+# -*- coding:Utf-8 -*-
+
+import pygame
+import pymunk
+
+from Classes.text_surfaces import text_surfaces
+from Scripts.configurations import sp_cfg
+
+ALL_SHAPES = pymunk.ShapeFilter()
+STATIC_COLOR = pygame.Color(200, 200, 200)
+DYNAMIC_COLOR = pygame.Color(52, 152, 219)
+TEXT_COLOR = pygame.Color(255, 255, 0)
+FPS_FONT_SIZE = 24
+
+
+class DebugOverlay:
+
+    def __init__(self, space, window, camera, clock=None):
+        self.space = space
+        self.window = window
+        self.camera = camera
+        self.clock = clock  # les fps sont affichees si une horloge est donnee
+        self.enabled = False
+        self.drawn = False  # l'overlay a ete dessine depuis le dernier nettoyage de la fenetre
+
+    def toggle(self):
+        self.enabled = not self.enabled
+
+    def view_bb(self):
+        rect = self.camera.view_rect()
+        height = self.window.get_height()
+        return pymunk.BB(rect.left, height - rect.bottom, rect.right, height - rect.top)
+
+    def to_screen(self, point):
+        return (round(point[0]) + int(self.camera.offset[0]),
+                self.window.get_height() - round(point[1]) + int(self.camera.offset[1]))
+
+    def draw(self):
+        if not self.enabled:
+            return
+        for shape in self.space.bb_query(self.view_bb(), ALL_SHAPES):
+            self.draw_shape(shape)
+        if self.clock is not None:
+            self.window.fill((0, 0, 0), (4, 4, FPS_FONT_SIZE * 2, FPS_FONT_SIZE + 8))
+            text_surfaces.draw_number(self.window, (8, 8), sp_cfg['font'], FPS_FONT_SIZE, round(self.clock.get_fps()),
+                                      TEXT_COLOR)
+        self.drawn = True
+
+    def draw_shape(self, shape):
+        body = shape.body
+        color = STATIC_COLOR if body.body_type == pymunk.Body.STATIC else DYNAMIC_COLOR
+
+        if isinstance(shape, pymunk.Segment):
+            pygame.draw.line(self.window, color,
+                             self.to_screen(body.local_to_world(shape.a)),
+                             self.to_screen(body.local_to_world(shape.b)),
+                             max(1, round(shape.radius * 2)))
+
+        elif isinstance(shape, pymunk.Poly):
+            points = [self.to_screen(body.local_to_world(v)) for v in shape.get_vertices()]
+            pygame.draw.polygon(self.window, color, points, 1)
+
+        elif isinstance(shape, pymunk.Circle):
+            pygame.draw.circle(self.window, color,
+                               self.to_screen(body.local_to_world(shape.offset)),
+                               max(1, round(shape.radius)), 1)
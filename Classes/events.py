@@ -0,0 +1,70 @@
+# -*- coding:Utf-8 -*-
+
+import pygame
+from pygame.constants import MOUSEMOTION, QUIT
+
+
+class EventTable(dict):
+    # type d'evenement -> fonction, recopie dans un tableau indexe par le type ; SDL ne met dans la file
+    # que les evenements qui ont une fonction ou qui sont toujours autorises
+
+    def __init__(self, always_allowed=(QUIT,)):
+        super().__init__()
+        self.always_allowed = frozenset(always_allowed)
+        self.handlers = [None] * (pygame.NUMEVENTS + 1)
+
+    def apply(self):
+        # a rappeler si le module display de pygame est reinitialise
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(self.always_allowed.union(self)))
+
+    def __setitem__(self, event_type, handler):
+        super().__setitem__(event_type, handler)
+        self.handlers[event_type] = handler
+        pygame.event.set_allowed(event_type)
+
+    def __delitem__(self, event_type):
+        super().__delitem__(event_type)
+        self.handlers[event_type] = None
+        if event_type not in self.always_allowed:
+            pygame.event.set_blocked(event_type)
+
+    def pop(self, event_type, *default):
+        if event_type not in self:
+            return super().pop(event_type, *default)
+        handler = self[event_type]
+        del self[event_type]
+        return handler
+
+    def update(self, *args, **kwargs):
+        for event_type, handler in dict(*args, **kwargs).items():
+            self[event_type] = handler
+
+    def clear(self):
+        for event_type in list(self):
+            del self[event_type]
+
+
+def coalesce_mouse_motion(events):
+    # un seul MOUSEMOTION par frame : la derniere position, avec les deplacements cumules
+    last = None
+    count = 0
+    for i, event in enumerate(events):
+        if event.type == MOUSEMOTION:
+            last = i
+            count += 1
+    if count < 2:
+        return events
+
+    rel_x = rel_y = 0
+    coalesced = list()
+    for i, event in enumerate(events):
+        if event.type != MOUSEMOTION:
+            coalesced.append(event)
+            continue
+        rel_x += event.rel[0]
+        rel_y += event.rel[1]
+        if i == last:
+            coalesced.append(pygame.event.Event(MOUSEMOTION, pos=event.pos, rel=(rel_x, rel_y),
+                                                buttons=event.buttons))
+    return coalesced
@@ -0,0 +1,47 @@
+# -*- coding:Utf-8 -*-
+
+from math import gcd
+
+
+def line_key(a, b):
+    # droite portant le segment [a, b] (points entiers) : direction reduite et constante de l'equation
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx == dy == 0:
+        return 0, 0, a
+    divisor = gcd(dx, dy) or 1
+    dx, dy = dx // divisor, dy // divisor
+    if dx < 0 or (dx == 0 and dy < 0):
+        dx, dy = -dx, -dy
+    return dx, dy, dy * a[0] - dx * a[1]
+
+
+def merge_segments(segments):
+    # segments: (structure_id, a, b) a coordonnees entieres, les segments colineaires qui se touchent ou se
+    # chevauchent sont fusionnes en un seul, renvoie des (a, b, ids des structures couvertes)
+    lines = dict()
+    for structure_id, a, b in segments:
+        a, b = (int(a[0]), int(a[1])), (int(b[0]), int(b[1]))
+        key = line_key(a, b)
+        dx, dy = key[0], key[1]
+        # abscisses des extremites le long de la droite
+        ta, tb = a[0] * dx + a[1] * dy, b[0] * dx + b[1] * dy
+        if ta > tb:
+            ta, tb, a, b = tb, ta, b, a
+        lines.setdefault(key, list()).append((ta, tb, a, b, structure_id))
+
+    merged = list()
+    for runs in lines.values():
+        runs.sort(key=lambda run: run[0])
+        _, end, a, b, structure_id = runs[0]
+        ids = [structure_id]
+        for run in runs[1:]:
+            if run[0] <= end:
+                if run[1] > end:
+                    end, b = run[1], run[3]
+                ids.append(run[4])
+            else:
+                merged.append((a, b, tuple(ids)))
+                _, end, a, b, structure_id = run
+                ids = [structure_id]
+        merged.append((a, b, tuple(ids)))
+    return merged
@@ -0,0 +1,67 @@
+# -*- coding:Utf-8 -*-
+
+import os
+import time
+
+import pygame
+
+from Classes.controller import Controller
+from Classes.model import DATABASE_PATH, Model
+from Classes.viewer import Viewer
+from Scripts.logger import logger
+
+
+def use_dummy_driver():
+    # pygame est deja initialise a l'import des viewers : le module display est relance sans fenetre reelle
+    pygame.display.quit()
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    pygame.display.init()
+
+
+class HeadlessViewer(Viewer):
+    # aucune image n'est affichee et le temps simule avance d'une frame complete a chaque tour de boucle,
+    # aussi vite que possible
+
+    def __init__(self, frames=None, framerate=60):
+        super().__init__(None, framerate)
+        self.frames = frames  # None : jusqu'a stop_loop
+        self.frame_count = 0
+
+    def tick(self):
+        return 1000 / self.FRAMERATE
+
+    def present(self, rects):
+        pass
+
+    def play(self, level_id=1, render=False):
+        return super().play(level_id, render)
+
+    def main(self):
+        rects = super().main()
+        self.frame_count += 1
+        if self.frames is not None and self.frame_count >= self.frames:
+            self.stop_loop()
+        return rects
+
+
+def run(level_id=1, frames=6000, framerate=60, size=(1280, 720), database_path=DATABASE_PATH, profiler=None):
+    use_dummy_driver()
+    model = Model(database_path)
+    viewer = HeadlessViewer(frames, framerate)
+    viewer.profiler = profiler
+    viewer.wdisplay(size)
+    controller = Controller(model, viewer)
+
+    viewer.play(level_id)
+    controller.page_handler.add_page('InGame', model, viewer, level_id)
+    page = controller.page_handler.current_page
+
+    t1 = time.perf_counter()
+    viewer.loop()
+    elapsed = time.perf_counter() - t1
+
+    simulated = viewer.frame_count / framerate
+    logger.info('headless run of level {}: {} frames ({:.1f} s simulated, {} physics steps) in {:.3f} s, '
+                '{:.0f} frames/s, {:.0f} steps/s'.format(level_id, viewer.frame_count, simulated, page.steps,
+                                                         elapsed, viewer.frame_count / elapsed, page.steps / elapsed))
+    return viewer.frame_count, page.steps, elapsed
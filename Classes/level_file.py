@@ -0,0 +1,57 @@
+# -*- coding:Utf-8 -*-
+
+import os
+
+import numpy as np
+
+LEVELS_DIRECTORY = os.path.join('data', 'levels')
+MAGIC = b'PLVL'
+VERSION = 1
+
+STRUCTURE_DTYPE = np.dtype([('id', '<i8'), ('x', '<i4'), ('y', '<i4'), ('type', '<i4')])
+
+# un en-tete de taille fixe suivi de count enregistrements STRUCTURE_DTYPE
+HEADER_DTYPE = np.dtype([('magic', 'S4'), ('version', '<u4'), ('level_id', '<i8'),
+                         ('base_pos_x', '<i4'), ('base_pos_y', '<i4'), ('bg_id', '<i4'), ('count', '<i8')])
+
+
+class LevelFileError(Exception):
+    pass
+
+
+def level_path(level_id, directory=LEVELS_DIRECTORY):
+    return os.path.join(directory, 'level_{}.lvl'.format(int(level_id)))
+
+
+def export_level(model, level_id, directory=LEVELS_DIRECTORY):
+    rows = model.execute('SELECT id, base_pos_x, base_pos_y, bg_id FROM LevelBaseInfo WHERE id = ?', (level_id,))
+    if not rows:
+        raise LevelFileError('level {} does not exist'.format(level_id))
+    structures = model.get_structures_array(level_id)
+
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (MAGIC, VERSION, level_id) + tuple(rows[0][1:]) + (len(structures),)
+
+    os.makedirs(directory, exist_ok=True)
+    path = level_path(level_id, directory)
+    with open(path + '.tmp', 'wb') as file:
+        file.write(header.tobytes())
+        file.write(structures.astype(STRUCTURE_DTYPE, copy=False).tobytes())
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def load_level(path):
+    # les structures ne sont pas copiees : le tableau est une projection du fichier en memoire
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) != 1 or header[0]['magic'] != MAGIC or header[0]['version'] != VERSION:
+        raise LevelFileError('"{}" is not a compiled level'.format(path))
+    header = header[0]
+    count = int(header['count'])
+    if os.path.getsize(path) != HEADER_DTYPE.itemsize + count * STRUCTURE_DTYPE.itemsize:
+        # fichier tronque ou corrompu : np.memmap echouerait ou lirait au dela des structures
+        raise LevelFileError('"{}" does not hold {} structures'.format(path, count))
+    if not count:
+        return header, np.empty(0, dtype=STRUCTURE_DTYPE)
+    structures = np.memmap(path, dtype=STRUCTURE_DTYPE, mode='r', offset=HEADER_DTYPE.itemsize, shape=(count,))
+    return header, structures
@@ -0,0 +1,52 @@
+# -*- coding:Utf-8 -*-
+
+import threading
+
+from Classes.assets import assets
+from Classes.model import Model, DATABASE_PATH
+from Classes.my_queue import DequeQueue as Queue
+from Scripts.logger import logger
+
+
+class LevelLoader:
+    # lit le niveau dans la base et decode ses images sur un autre thread
+
+    def __init__(self, level_id, image_paths=(), database_path=DATABASE_PATH):
+        self.level_id = int(level_id)
+        self.image_paths = tuple(image_paths)
+        self.database_path = database_path
+        self.total = 2 + len(self.image_paths)
+
+        self.messages = Queue()
+        self.level = self.structure_getter = self.error = None
+        self.done = False
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def start(self):
+        logger.debug('loading level {}'.format(self.level_id))
+        self.thread.start()
+        return self
+
+    def report(self, step):
+        self.messages.put((step, self.total))
+
+    def run(self):
+        try:
+            # une connexion sqlite ne peut etre utilisee que par le thread qui l'a creee
+            model = Model(self.database_path)
+            self.level = tuple(model.get_level(self.level_id))[0]
+            self.report(1)
+            self.structure_getter = model.structure_getter(self.level_id)
+            self.report(2)
+            model.database_connection.close()
+
+            for i, path in enumerate(self.image_paths):
+                assets.decode(path)
+                self.report(3 + i)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+
+    def poll(self):
+        return list(self.messages.elements())
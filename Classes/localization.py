@@ -0,0 +1,65 @@
+# -*- coding:Utf-8 -*-
+
+import os
+import pickle
+
+from Classes.model import LANGUAGES
+from Scripts.logger import logger
+
+CACHE_PATH = os.path.join('data', 'text.cache')
+FALLBACK_LANGUAGE = 'en'
+
+
+class Catalog:
+    # toute la table Text en memoire : {langue: {id: texte}}
+
+    def __init__(self, texts, language):
+        self.texts = texts
+        self.language = None
+        self.current = None
+        self.set_language(language)
+
+    @classmethod
+    def from_model(cls, model, language):
+        rows = model.get_text(LANGUAGES)
+        texts = {language_: {row[0]: row[i + 1] for row in rows if row[i + 1] is not None}
+                 for i, language_ in enumerate(LANGUAGES)}
+        return cls(texts, language)
+
+    @classmethod
+    def load(cls, model, language, cache_path=CACHE_PATH):
+        # le fichier de cache n'est valable que pour la version de la base qui l'a produit
+        mtime = os.path.getmtime(model.database_path)
+        try:
+            with open(cache_path, 'rb') as file:
+                cached_mtime, texts = pickle.load(file)
+            if cached_mtime == mtime:
+                return cls(texts, language)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            pass
+
+        catalog = cls.from_model(model, language)
+        try:
+            with open(cache_path, 'wb') as file:
+                pickle.dump((mtime, catalog.texts), file, pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            logger.warning('could not write the text cache: {}'.format(e))
+        return catalog
+
+    def set_language(self, language):
+        if language not in self.texts:
+            raise ValueError('unknown language "{}"'.format(language))
+        self.language = language
+        self.current = self.texts[language]
+
+    def get(self, text_id, default=None):
+        try:
+            return self.current[text_id]
+        except KeyError:
+            return self.texts[FALLBACK_LANGUAGE].get(text_id, default)
+
+    def __getitem__(self, text_id):
+        text = self.get(text_id)
+        if text is None:
+            raise KeyError(text_id)
+        return text
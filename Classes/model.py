@@ -1,85 +1,208 @@
 # -*- coding:Utf-8 -*-
 
+import os
 import sqlite3
 
+import numpy as np
+
+from Classes.level_file import LEVELS_DIRECTORY, STRUCTURE_DTYPE, LevelFileError, level_path, load_level
 from Scripts.logger import logger
 
+DATABASE_PATH = os.path.join('data', 'data.db')
+LANGUAGES = ('en', 'fr', 'de')  # seules colonnes de la table Text qui peuvent etre interpolees dans le code SQL
+
+# chaque migration n'est appliquee qu'une fois, PRAGMA user_version compte celles deja appliquees
+MIGRATIONS = (
+    # index couvrant : les structures d'un niveau sont lues sans toucher a la table
+    'CREATE INDEX IF NOT EXISTS LevelStructures_level ON LevelStructures (level_id, pos_x, pos_y, type)',
+)
+
 
 class Model:
 
-    def __init__(self):
+    def __init__(self, database_path=DATABASE_PATH, levels_directory=LEVELS_DIRECTORY):
         logger.debug('initialize Model')
-        self.database_connection = sqlite3.connect('data\\data.db')
-        self.cursor = self.database_connection.cursor()
+        self.database_path = database_path
+        self.levels_directory = levels_directory
+        self.database_connection = sqlite3.connect(database_path)
+        self.statements = dict()  # forme de la requete -> code SQL, sqlite garde les requetes compilees par code
+        self.tables = dict()  # tables qui ne changent pas pendant le jeu, lues une seule fois
+        self.migrate()
+
+    def migrate(self):
+        version = self.database_connection.execute('PRAGMA user_version').fetchone()[0]
+        for version, code in enumerate(MIGRATIONS[version:], version + 1):
+            logger.info('applying database migration {}'.format(version))
+            with self.database_connection:
+                self.database_connection.execute(code)
+                self.database_connection.execute('PRAGMA user_version = {:d}'.format(version))
+
+    def statement(self, shape, build):
+        try:
+            return self.statements[shape]
+        except KeyError:
+            code = self.statements[shape] = build()
+            return code
+
+    def execute(self, code, args=()):
+        # chaque requete a son propre curseur et son resultat est entierement lu
+        return self.database_connection.execute(code, args).fetchall()
+
+    @staticmethod
+    def check_languages(languages):
+        for language in languages:
+            if language not in LANGUAGES:
+                raise ValueError('unknown language "{}"'.format(language))
+
+    def get_table(self, table_name):
+        try:
+            return self.tables[table_name]
+        except KeyError:
+            pass
+
+        if table_name == 'Text':
+            code = 'SELECT id, ' + ', '.join(LANGUAGES) + ' FROM Text'
+            table = {row[0]: dict(zip(LANGUAGES, row[1:])) for row in self.execute(code)}
+        elif table_name == 'StructureType':
+            table = dict(self.execute('SELECT structure_id, label FROM StructureType'))
+        elif table_name == 'BackgroundType':
+            table = dict(self.execute('SELECT bg_id, label FROM BackgroundType'))
+        else:
+            raise ValueError('"{}" is not an immutable table'.format(table_name))
+
+        self.tables[table_name] = table
+        return table
 
     def get_text(self, languages, text_id=-1):
+        languages = tuple(languages)
+        self.check_languages(languages)
+        text = self.get_table('Text')
 
-        code = '''SELECT id, ''' + ', '.join(languages) + ''' FROM Text'''
         if text_id != -1:
-            code += ' WHERE id = {}'.format(text_id)
-
-        return self.cursor.execute(code)
+            ids = (text_id,) if text_id in text else ()
+        else:
+            ids = text.keys()
+        return [(i,) + tuple(text[i][language] for language in languages) for i in ids]
+
+    def compiled_level(self, level_id):
+        # le fichier compile n'est utilise que s'il est plus recent que la base de donnees
+        path = level_path(level_id, self.levels_directory)
+        try:
+            if os.path.getmtime(path) <= os.path.getmtime(self.database_path):
+                return None
+            return load_level(path)
+        except (OSError, LevelFileError) as error:
+            if os.path.exists(path):
+                logger.warning('compiled level ignored: {}'.format(error))
+            return None
 
     def get_level(self, level_id=-1):
-
-        code = '''SELECT id, base_pos_x, base_pos_y, label
-        FROM LevelBaseInfo JOIN BackgroundType on LevelBaseInfo.bg_id = BackgroundType.bg_id'''
-        args = []
-
-        if level_id != -1:
-            code += ' WHERE id = ?'
-            args.append(level_id)
-
-        return self.cursor.execute(code, args)
+        compiled = self.compiled_level(level_id) if level_id != -1 else None
+        if compiled is not None:
+            header = compiled[0]
+            backgrounds = self.get_table('BackgroundType')
+            bg_id = int(header['bg_id'])
+            if bg_id not in backgrounds:
+                return []
+            return [(int(header['level_id']), int(header['base_pos_x']), int(header['base_pos_y']),
+                     backgrounds[bg_id])]
+
+        code = self.statement(('get_level', level_id != -1), lambda: (
+            'SELECT id, base_pos_x, base_pos_y, bg_id FROM LevelBaseInfo' +
+            (' WHERE id = ?' if level_id != -1 else '')))
+        args = (level_id,) if level_id != -1 else ()
+
+        backgrounds = self.get_table('BackgroundType')
+        return [row[:3] + (backgrounds[row[3]],) for row in self.execute(code, args)
+                if row[3] in backgrounds]
 
     def get_structures(self, level_id=-1, structure_id=-1):
-
-        code = '''SELECT id, level_id, pos_x, pos_y, label
-        FROM LevelStructures JOIN StructureType on LevelStructures.type = StructureType.structure_id'''
-
-        args = []
-
         if structure_id != -1:
-            code += ' WHERE id = ?'
-            args.append(structure_id)
-
+            shape, args = 'id', (structure_id,)
         elif level_id != -1:
-            code += ' WHERE level_id = ?'
-            args.append(level_id)
-
-        return self.cursor.execute(code, args)
-
-    def structure_getter(self, level_id=-1):
-        return self._StructureGetter(self.get_structures(level_id))
-
-    class _StructureGetter:
-        def __init__(self, structures):
-            self._structures = tuple(structures)
-            self._dif = self._structures[0][0]
+            shape, args = 'level_id', (level_id,)
+        else:
+            shape, args = None, ()
+        code = self.statement(('get_structures', shape), lambda: (
+            'SELECT id, level_id, pos_x, pos_y, type FROM LevelStructures' +
+            (' WHERE {} = ?'.format(shape) if shape is not None else '')))
+
+        structure_types = self.get_table('StructureType')
+        return [row[:4] + (structure_types[row[4]],) for row in self.execute(code, args)
+                if row[4] in structure_types]
+
+    def get_structures_array(self, level_id):
+        # toutes les structures d'un niveau en un seul fetchall, triees de gauche a droite par l'index
+        code = 'SELECT id, pos_x, pos_y, type FROM LevelStructures WHERE level_id = ? ORDER BY pos_x'
+        rows = self.execute(code, (level_id,))
+        return np.fromiter(rows, dtype=STRUCTURE_DTYPE, count=len(rows))
+
+    def structure_getter(self, level_id):
+        compiled = self.compiled_level(level_id)
+        array = compiled[1] if compiled is not None else self.get_structures_array(level_id)
+        return self.StructureStore(level_id, array, self.get_table('StructureType'))
+
+    class StructureStore:
+        # les lignes (id, level_id, pos_x, pos_y, label) ne sont construites qu'a la demande
+
+        def __init__(self, level_id, array, labels):
+            self.level_id = level_id
+            labels_ok = np.isin(array['type'], tuple(labels))
+            self.array = array if labels_ok.all() else array[labels_ok]
+            self.labels = labels
+
+            ids = self.array['id']
+            if not len(ids):
+                self._first = 0
+                self._rows = np.empty(0, dtype=np.int64)
+            elif ids.max() - ids.min() < 4 * len(ids):
+                # ids presque contigus : tableau id -> ligne, -1 pour les ids supprimes
+                self._first = int(ids.min())
+                self._rows = np.full(int(ids.max()) - self._first + 1, -1, dtype=np.int64)
+                self._rows[ids - self._first] = np.arange(len(ids))
+            else:
+                self._first = None
+                self._rows = dict(zip(ids.tolist(), range(len(ids))))
+
+        def row_index(self, structure_id):
+            if self._first is None:
+                return self._rows.get(structure_id, -1)
+            i = structure_id - self._first
+            if i < 0 or i >= len(self._rows):
+                return -1
+            return int(self._rows[i])
+
+        def row(self, i):
+            structure = self.array[i]
+            return (int(structure['id']), self.level_id, int(structure['x']), int(structure['y']),
+                    self.labels[int(structure['type'])])
 
         def __getitem__(self, index):
             return self.get(index)
 
         def get(self, index, default=None):
-            try:
-                if index < 1:
-                    raise IndexError
-                value = self._structures[index - self._dif]
-            except IndexError:
+            i = self.row_index(index) if index >= 1 else -1
+            if i < 0:
                 if default is not None:
                     return default
                 raise IndexError('id "{}" does not exist or is out of range'.format(index))
-            return value
+            return self.row(i)
+
+        def __len__(self):
+            return len(self.array)
+
+        def __contains__(self, index):
+            return self.row_index(index) >= 0
 
         def __repr__(self):
-            tab = tuple(repr(a) for a in self._structures)
+            tab = tuple(repr(a) for a in self)
             return 'struct([' + (',\n' + ' ' * 8).join(tab) + '])'
 
         def __str__(self):
-            return repr(self._structures)
+            return repr(tuple(self))
 
         def __iter__(self):
-            return iter(self._structures)
+            return (self.row(i) for i in range(len(self.array)))
 
 
 if __name__ == '__main__':
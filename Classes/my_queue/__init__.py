@@ -1,6 +1,7 @@
 # -*- coding:Utf-8 -*-
 
 from .basic_queue import DequeQueue, StackQueue, MaxsizeDequeQueue, MaxsizeStackQueue
-from .priority_queue import PriorityQueue, timeit
+from .priority_queue import PriorityQueue
+from Scripts.timing import timeit  # deplace dans Scripts.timing, garde ici pour les anciens imports
 from .exceptions import Empty, Full
 
@@ -1,27 +1,10 @@
 # -*- coding:Utf-8 -*-
 
-import time
 import numpy as np
 from .exceptions import Full, Empty
 import code
 
 
-def timeit(func, loop):
-    times = list()
-    tt1 = time.process_time()
-    for _ in range(loop):
-        t1 = time.perf_counter()
-        func()
-        times.append(time.perf_counter() - t1)
-    tt2 = time.process_time()
-
-    mint, maxt = min(times), max(times)
-    mean = sum(times) / len(times)
-    tt = tt2 - tt1
-    print(f'''min : {mint}, max : {maxt},
-'mean : {mean}, total time : {tt}''')
-
-
 class PriorityQueue:
     def __init__(self, size):
         self.array = np.zeros(size, dtype=np.uint16) + 65535
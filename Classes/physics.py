@@ -0,0 +1,73 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+import pymunk
+
+
+class LevelMetrics:
+
+    def __init__(self, count, segment_length, length_spread, width, bodies=1):
+        self.count = count  # nombre de segments presents en meme temps dans l'espace
+        self.bodies = bodies  # nombre de formes mobiles
+        self.segment_length = segment_length  # longueur mediane des segments
+        self.length_spread = length_spread  # ecart type relatif des longueurs
+        self.width = width
+
+    @classmethod
+    def from_structures(cls, store, sizes, loaded_width=None, bodies=1):
+        # store: Model.StructureStore, sizes: type de structure -> (largeur, hauteur) des segments
+        array = store.array
+        if not len(array):
+            return cls(0, 0., 0., 0, bodies)
+        lengths = np.zeros(max(sizes) + 1, dtype=np.float64)
+        for structure_type, size in sizes.items():
+            lengths[structure_type] = size[0]
+        lengths = lengths[array['type']]
+
+        width = int(array['x'].max() + lengths.max() - array['x'].min())
+        count = len(array)
+        if loaded_width is not None and loaded_width < width:
+            # avec le streaming, seule une partie du niveau est dans l'espace
+            count = int(np.ceil(count * loaded_width / width))
+        mean = lengths.mean()
+        spread = float(lengths.std() / mean) if mean else 0.
+        return cls(count, float(np.median(lengths)), spread, width, bodies)
+
+    def __repr__(self):
+        return 'LevelMetrics(count={}, segment_length={}, length_spread={:.3f}, width={}, bodies={})'.format(
+            self.count, self.segment_length, self.length_spread, self.width, self.bodies)
+
+
+class SpaceFactory:
+
+    def __init__(self, gravity=(0, -1000), broadphase='bb_tree', iterations=10,
+                 sleep_time_threshold=float('inf'), collision_slop=.1):
+        if broadphase not in ('bb_tree', 'spatial_hash'):
+            raise ValueError('unknown broadphase "{}"'.format(broadphase))
+        self.gravity = gravity
+        self.broadphase = broadphase
+        self.iterations = iterations
+        self.sleep_time_threshold = sleep_time_threshold
+        self.collision_slop = collision_slop
+
+    @classmethod
+    def from_config(cls, cfg, gravity=(0, -1000)):
+        return cls(gravity, cfg['broadphase'], cfg.getint('space_iterations'),
+                   cfg.getfloat('sleep_time_threshold'), cfg.getfloat('collision_slop'))
+
+    @staticmethod
+    def spatial_hash_args(metrics):
+        # cellules de la taille d'un segment, une entree par forme presente dans l'espace
+        return max(metrics.segment_length, 1.), max(metrics.count + metrics.bodies, 1)
+
+    def create(self, metrics=None):
+        space = pymunk.Space()
+        space.gravity = self.gravity
+        space.iterations = self.iterations
+        space.sleep_time_threshold = self.sleep_time_threshold
+        space.collision_slop = self.collision_slop
+        if self.broadphase == 'spatial_hash':
+            if metrics is None:
+                raise ValueError('the spatial hash is sized from the level metrics')
+            space.use_spatial_hash(*self.spatial_hash_args(metrics))
+        return space
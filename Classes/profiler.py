@@ -0,0 +1,102 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+
+PERCENTILES = (50, 95, 99)
+
+
+class FrameProfiler:
+    # duree de chaque phase des capacity dernieres frames, une ligne par frame et une colonne par phase
+
+    def __init__(self, capacity=4096, max_phases=32, path=None):
+        self.capacity = capacity
+        self.path = path
+        self.times = np.zeros((capacity, max_phases), dtype=np.float64)
+        self.frames = np.full(capacity, -1, dtype=np.int64)
+        self.phases = dict()  # nom de la phase -> colonne
+        self.names = dict()  # action -> nom de sa phase
+        self.count = 0
+        self.row = self.times[0]
+
+    def column(self, name):
+        try:
+            return self.phases[name]
+        except KeyError:
+            pass
+        # les phases en trop sont regroupees dans la derniere colonne
+        column = min(len(self.phases), self.times.shape[1] - 1)
+        if column == self.times.shape[1] - 1:
+            name = 'other'
+            if name in self.phases:
+                return column
+        self.phases[name] = column
+        return column
+
+    def action_name(self, action):
+        try:
+            return self.names[action]
+        except KeyError:
+            name = self.names[action] = 'action ' + getattr(action, '__qualname__', repr(action))
+            return name
+
+    def begin(self, frame_index):
+        i = self.count % self.capacity
+        self.row = self.times[i]
+        self.row[:] = 0.
+        self.frames[i] = frame_index
+        self.count += 1
+
+    def add(self, name, seconds):
+        self.row[self.column(name)] += seconds
+
+    def history(self):
+        # frames et durees dans l'ordre chronologique
+        if self.count <= self.capacity:
+            return self.frames[:self.count], self.times[:self.count, :len(self.phases)]
+        order = np.roll(np.arange(self.capacity), -(self.count % self.capacity))
+        return self.frames[order], self.times[order, :len(self.phases)]
+
+    def stats(self):
+        # nom -> (p50, p95, p99, max) en ms, 'frame' est la somme des phases hors attente de tick
+        frames, times = self.history()
+        if not len(frames):
+            return dict()
+        columns = dict(self.phases)
+        busy = times.sum(axis=1)
+        if 'tick' in columns:
+            busy -= times[:, columns['tick']]
+        result = dict()
+        for name, values in [('frame', busy)] + [(name, times[:, i]) for name, i in columns.items()]:
+            result[name] = tuple(np.percentile(values, PERCENTILES) * 1000) + (values.max() * 1000,)
+        return result
+
+    def worst(self, n=5):
+        frames, times = self.history()
+        busy = times.sum(axis=1)
+        if 'tick' in self.phases:
+            busy -= times[:, self.phases['tick']]
+        names = list(self.phases)
+        report = list()
+        for i in np.argsort(busy)[::-1][:n]:
+            phases = sorted(zip(names, times[i] * 1000), key=lambda item: -item[1])
+            report.append((int(frames[i]), busy[i] * 1000, [phase for phase in phases if phase[1] > 0]))
+        return report
+
+    def report(self, n=5):
+        lines = ['{} frames profiled'.format(min(self.count, self.capacity))]
+        for name, values in self.stats().items():
+            lines.append('{:<48} p50 : {:8.3f} ms, p95 : {:8.3f} ms, p99 : {:8.3f} ms, max : {:8.3f} ms'.format(
+                name, *values))
+        for frame, busy, phases in self.worst(n):
+            lines.append('frame {} : {:.3f} ms ({})'.format(
+                frame, busy, ', '.join('{} {:.3f} ms'.format(*phase) for phase in phases[:4])))
+        return '\n'.join(lines)
+
+    def dump(self, path=None):
+        path = self.path if path is None else path
+        if not path.endswith('.npz'):
+            path += '.npz'  # np.savez_compressed ajouterait l'extension de toute facon
+        frames, times = self.history()
+        np.savez_compressed(path, frames=frames, times=times.astype(np.float32),
+                            phases=np.array(list(self.phases)))
+        return path
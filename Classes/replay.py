@@ -0,0 +1,87 @@
+# -*- coding:Utf-8 -*-
+
+import os
+
+import numpy as np
+import pygame
+from pygame.constants import KEYDOWN, KEYUP, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION
+
+MAGIC = b'PRPL'
+VERSION = 1
+RECORDED_TYPES = (KEYDOWN, KEYUP, MOUSEMOTION, MOUSEBUTTONDOWN, MOUSEBUTTONUP)
+
+# un en-tete de taille fixe suivi de count evenements tries par frame
+HEADER_DTYPE = np.dtype([('magic', 'S4'), ('version', '<u4'), ('framerate', '<u4'), ('frames', '<u4'),
+                         ('count', '<u4')])
+EVENT_DTYPE = np.dtype([('frame', '<u4'), ('type', '<u4'), ('key', '<i4'), ('mod', '<u2'), ('button', '<u1'),
+                        ('x', '<i2'), ('y', '<i2')])
+
+
+class ReplayFileError(Exception):
+    pass
+
+
+class InputRecorder:
+
+    def __init__(self, types=RECORDED_TYPES):
+        self.types = frozenset(types)
+        self.records = list()
+
+    def record(self, frame, events):
+        for event in events:
+            if event.type not in self.types:
+                continue
+            if event.type in (KEYDOWN, KEYUP):
+                self.records.append((frame, event.type, event.key, event.mod, 0, 0, 0))
+            else:
+                self.records.append((frame, event.type, 0, 0, getattr(event, 'button', 0)) + tuple(event.pos))
+        return events
+
+    def save(self, path, framerate, frames):
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header[0] = MAGIC, VERSION, framerate, frames, len(self.records)
+        with open(path + '.tmp', 'wb') as file:
+            file.write(header.tobytes())
+            file.write(np.array(self.records, dtype=EVENT_DTYPE).tobytes())
+        os.replace(path + '.tmp', path)
+        return path
+
+
+class InputReplay:
+    # rend les evenements enregistres aux memes frames, a la place des evenements reels
+
+    def __init__(self, path):
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+        if len(header) != 1 or header[0]['magic'] != MAGIC or header[0]['version'] != VERSION:
+            raise ReplayFileError('"{}" is not an input recording'.format(path))
+        self.framerate = int(header[0]['framerate'])
+        self.frames = int(header[0]['frames'])
+        self.records = np.fromfile(path, dtype=EVENT_DTYPE, count=int(header[0]['count']),
+                                   offset=HEADER_DTYPE.itemsize)
+        self.cursor = 0
+
+    @staticmethod
+    def to_event(record):
+        event_type = int(record['type'])
+        if event_type in (KEYDOWN, KEYUP):
+            return pygame.event.Event(event_type, key=int(record['key']), mod=int(record['mod']),
+                                      unicode='', scancode=0)
+        pos = int(record['x']), int(record['y'])
+        if event_type == MOUSEMOTION:
+            return pygame.event.Event(event_type, pos=pos, rel=(0, 0), buttons=(0, 0, 0))
+        return pygame.event.Event(event_type, pos=pos, button=int(record['button']))
+
+    def events(self, frame):
+        start = self.cursor
+        end = start + int(np.searchsorted(self.records['frame'][start:], frame, side='right'))
+        self.cursor = end
+        events = [self.to_event(record) for record in self.records[start:end]]
+        for event in events:
+            if event.type in (KEYDOWN, KEYUP):
+                # le jeu lit aussi l'etat des modificateurs avec pygame.key.get_mods
+                pygame.key.set_mods(event.mod)
+        return events
+
+    @property
+    def finished(self):
+        return self.cursor >= len(self.records)
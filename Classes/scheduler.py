@@ -0,0 +1,27 @@
+# -*- coding:Utf-8 -*-
+
+
+class FixedTimestep:
+
+    def __init__(self, dt, max_steps=15):
+        self.dt = dt
+        self.max_steps = max_steps  # au dela, le retard est abandonne plutot que rattrape
+        self.accumulator = 0.
+
+    def advance(self, elapsed):
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.
+        else:
+            self.accumulator -= steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        # position du rendu entre les deux derniers etats physiques
+        return self.accumulator / self.dt
+
+    def reset(self):
+        self.accumulator = 0.
@@ -0,0 +1,68 @@
+# -*- coding:Utf-8 -*-
+
+from pygame import Rect
+
+
+class UniformGrid:
+
+    def __init__(self, cell_size=256):
+        self.cell_size = cell_size
+        self.cells = dict()
+        self.rects = dict()
+
+    @classmethod
+    def from_structures(cls, store, sizes, cell_size=256):
+        # store: Model.StructureStore, sizes: type de structure -> (largeur, hauteur), comme LevelMetrics
+        grid = cls(cell_size)
+        array = store.array
+        for structure_id, x, y, structure_type in zip(array['id'].tolist(), array['x'].tolist(),
+                                                      array['y'].tolist(), array['type'].tolist()):
+            grid.insert(structure_id, Rect((x, y), sizes[structure_type]))
+        return grid
+
+    def _cells(self, rect):
+        size = self.cell_size
+        for x in range(rect.left // size, (rect.right - 1) // size + 1):
+            for y in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield x, y
+
+    def insert(self, item, rect):
+        if item in self.rects:
+            self.remove(item)
+        rect = Rect(rect)
+        self.rects[item] = rect
+        for cell in self._cells(rect):
+            self.cells.setdefault(cell, dict())[item] = None
+
+    def remove(self, item):
+        rect = self.rects.pop(item)
+        for cell in self._cells(rect):
+            content = self.cells[cell]
+            del content[item]
+            if not content:
+                del self.cells[cell]
+        return rect
+
+    def query_rect(self, rect):
+        found = dict()
+        for cell in self._cells(rect):
+            content = self.cells.get(cell)
+            if content:
+                found.update(content)
+        rects = self.rects
+        return [item for item in found if rect.colliderect(rects[item])]
+
+    def query_point(self, point):
+        size = self.cell_size
+        content = self.cells.get((int(point[0]) // size, int(point[1]) // size), ())
+        rects = self.rects
+        return [item for item in content if rects[item].collidepoint(point)]
+
+    def __len__(self):
+        return len(self.rects)
+
+    def __contains__(self, item):
+        return item in self.rects
+
+    def __iter__(self):
+        return iter(self.rects)
@@ -0,0 +1,52 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+
+
+class LevelStreamer:
+    # seules les structures des bandes de chunk_width pixels proches du joueur existent dans le jeu,
+    # une bande chargee n'est dechargee qu'au dela de unload_radius bandes pour ne pas osciller a la frontiere
+
+    def __init__(self, store, load_callback, unload_callback, chunk_width=1024, load_radius=1, unload_radius=2):
+        if unload_radius < load_radius:
+            raise ValueError('unload_radius must be greater than or equal to load_radius')
+        self.store = store
+        self.load_callback = load_callback
+        self.unload_callback = unload_callback
+        self.chunk_width = chunk_width
+        self.load_radius = load_radius
+        self.unload_radius = unload_radius
+
+        # bande -> indices des lignes du store, calcule une seule fois a partir des positions
+        keys = np.floor_divide(store.array['x'], chunk_width)
+        order = np.argsort(keys, kind='stable')
+        chunk_ids, starts = np.unique(keys[order], return_index=True)
+        self.chunks = dict(zip(chunk_ids.tolist(), np.split(order, starts[1:])))
+
+        self.loaded = dict()  # bande -> ids des structures chargees
+        self.current = None
+
+    def update(self, x):
+        chunk = int(x) // self.chunk_width
+        if chunk == self.current:
+            return
+        self.current = chunk
+
+        for i in [i for i in self.loaded if abs(i - chunk) > self.unload_radius]:
+            self.unload_callback(self.loaded.pop(i))
+
+        for i in range(chunk - self.load_radius, chunk + self.load_radius + 1):
+            if i in self.loaded or i not in self.chunks:
+                continue
+            rows = [self.store.row(j) for j in self.chunks[i]]
+            self.load_callback(rows)
+            self.loaded[i] = [row[0] for row in rows]
+
+    def clear(self):
+        for ids in self.loaded.values():
+            self.unload_callback(ids)
+        self.loaded.clear()
+        self.current = None
+
+    def __len__(self):
+        return sum(len(ids) for ids in self.loaded.values())
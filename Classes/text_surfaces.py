@@ -0,0 +1,90 @@
+# -*- coding:Utf-8 -*-
+
+from collections import OrderedDict
+
+import pygame
+
+from Classes.assets import assets
+
+GLYPHS = '0123456789-+.,:% '
+GLYPH_SET = frozenset(GLYPHS)
+# un compteur court prend peu de valeurs differentes (les fps par exemple) : chaque valeur est rendue une fois
+# et gardee avec les autres textes ; au dela, il est compose de glyphes pour ne pas remplir le cache
+SHORT_COUNTER_LENGTH = 4
+
+
+class TextSurfaceCache:
+    # surfaces de texte deja rendues, les moins recemment utilisees sont oubliees au dela de max_bytes
+
+    def __init__(self, max_bytes=4 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()  # (police, taille, texte, couleur, antialias) -> surface
+        self.bytes = 0
+        self.fonts = dict()  # (police, taille) -> police, gardees par le cache tant qu'il n'est pas vide
+        self.glyph_sets = dict()  # (police, taille, couleur, antialias) -> caractere -> surface
+        self.hits = self.misses = 0
+
+    def font(self, path, size):
+        key = (path, size)
+        try:
+            return self.fonts[key]
+        except KeyError:
+            font = self.fonts[key] = assets.font(path, size)
+            return font
+
+    def render(self, path, size, text, color, antialias=True):
+        key = (path, size, text, tuple(pygame.Color(color)), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.surfaces[key] = self.font(path, size).render(text, antialias, color)
+        self.bytes += surface.get_bytesize() * surface.get_width() * surface.get_height()
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, old = self.surfaces.popitem(last=False)
+            self.bytes -= old.get_bytesize() * old.get_width() * old.get_height()
+        return surface
+
+    def glyphs(self, path, size, color, antialias=True):
+        # chiffres et signes d'un compteur, rendus une fois pour chaque police et couleur
+        key = (path, size, tuple(pygame.Color(color)), antialias)
+        try:
+            return self.glyph_sets[key]
+        except KeyError:
+            font = self.font(path, size)
+            glyphs = self.glyph_sets[key] = {char: font.render(char, antialias, color) for char in GLYPHS}
+            return glyphs
+
+    def draw_number(self, window, pos, path, size, value, color, antialias=True):
+        text = str(value)
+        if len(text) <= SHORT_COUNTER_LENGTH or not GLYPH_SET.issuperset(text):
+            # 'inf', 'nan' ou '1e+20' n'ont pas tous leurs glyphes
+            surface = self.render(path, size, text, color, antialias)
+            return window.blit(surface, pos)
+
+        glyphs = self.glyphs(path, size, color, antialias)
+        x, y = pos
+        blits = list()
+        for char in text:
+            glyph = glyphs[char]
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        window.blits(blits, False)
+        return pygame.Rect(pos[0], y, x - pos[0], glyphs['0'].get_height())
+
+    def clear(self):
+        self.surfaces.clear()
+        self.glyph_sets.clear()
+        self.bytes = 0
+        for path, size in self.fonts:
+            assets.release_font(path, size)
+        self.fonts.clear()
+
+    def __len__(self):
+        return len(self.surfaces)
+
+
+text_surfaces = TextSurfaceCache()
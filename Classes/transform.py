@@ -0,0 +1,29 @@
+# -*- coding:Utf-8 -*-
+
+
+class CoordinateTransform:
+    # conversion pymunk (y vers le haut) <-> pygame (y vers le bas) avec le decalage de la camera
+
+    def __init__(self, height, offset):
+        self.height = height
+        self.offset = offset
+
+    def to_pygame(self, p):
+        offset = self.offset
+        return int(p[0]) + int(offset[0]), self.height - int(p[1]) + int(offset[1])
+
+    def from_pygame(self, p):
+        offset = self.offset
+        return int(p[0]) - int(offset[0]), self.height - int(p[1]) + int(offset[1])
+
+    def from_world(self, p):
+        # coordonnees pygame du niveau, sans le decalage de la camera
+        return int(p[0]), self.height - int(p[1])
+
+    def place_rect(self, rect, p, dx=0, dy=0):
+        # place le rect en coordonnees de la fenetre sans construire de tuple intermediaire
+        x, y = p
+        offset_x, offset_y = self.offset.tolist()
+        rect.x = int(x) + offset_x + dx
+        rect.y = self.height - int(y) + offset_y + dy
+        return rect
@@ -1,41 +1,85 @@
 # -*- coding:Utf-8 -*-
 
+import os
+
 from Scripts.logger import logger
 import pygame
 from pygame.locals import *
 
-import pymunk.pygame_util
-import numpy as np
-
+from Classes.assets import assets
 from Classes.page_handler import PageHandler
 from Classes.base_viewer import BaseViewer
+from Classes.camera import Camera
+from Classes.chunk_cache import ChunkCache
+from Classes.spatial_index import UniformGrid
+from Classes.text_surfaces import text_surfaces
+from Classes.transform import CoordinateTransform
 import sprites.sprites as sprites
-from Scripts.configurations import sp_cfg, general_cfg
+from Scripts.configurations import general_cfg, sp_cfg, ig_cfg
 pygame.init()
 
 
 class Viewer(BaseViewer):
-    def __init__(self, text_getter, framerate=30):
+    def __init__(self, catalog, framerate=30, pacing=None):
         logger.debug('initialize Viewer')
-        super(Viewer, self).__init__(framerate, logger)
+        if pacing is None:
+            pacing = general_cfg['frame_pacing']
+        super(Viewer, self).__init__(framerate, logger, pacing, general_cfg.getint('unfocused_framerate'))
         self.page_handler = self.ViewerPageHandler()
-        self.text_getter = text_getter
+        self.catalog = catalog
 
     def init_pages(self):
-        self.page_handler.add_page('StartingPage', self.events, self.text_getter)
+        self.page_handler.add_page('StartingPage', self.events, self.catalog)
+        self.preload_level_assets()
+
+    @staticmethod
+    def preload_level_assets():
+        # les images du niveau sont decodees pendant que le menu est affiche
+        return assets.preload(path for path, mode in Viewer.ViewerPageHandler.InGame.ASSETS)
+
+    def show_loading(self):
+        self.page_handler.current_page.unbind_events()
+        self.page_handler.switch_page('LoadingPage', self.events)
+
+    def show_menu(self):
+        self.page_handler.current_page.unbind_events()
+        self.page_handler.switch_page('StartingPage', self.events, self.catalog)
 
-    def play(self):
+    def play(self, level_id=1, render=True):
+        if self.page_handler.current_page is None:
+            # sans menu, par exemple en mode headless
+            return self.page_handler.add_page('InGame', self.events, self.actions, level_id, render=render)
         self.page_handler.current_page.unbind_events()
-        self.page_handler.switch_page('InGame', self.events, self.actions, 1)
+        self.page_handler.switch_page('InGame', self.events, self.actions, level_id, render=render)
 
     def main(self):
-        self.page_handler.current_page.update()
+        return self.page_handler.current_page.update()
+
+    def is_idle(self):
+        page = self.page_handler.current_page
+        return not self.actions and page is not None and page.idle()
+
+    def needs_precise_pacing(self):
+        page = self.page_handler.current_page
+        return page is not None and page.precise_pacing
+
+    def repaint(self):
+        page = self.page_handler.current_page
+        if page is not None:
+            page.flipped = False
 
     class ViewerPageHandler(PageHandler):
 
         class _ViewerPage:
+            precise_pacing = False  # la page bouge a chaque frame et doit etre affichee a intervalles reguliers
+
             def __init__(self, event_dict):
                 self.events = event_dict
+                self.flipped = False  # la prochaine frame affiche toute la fenetre tant que c'est faux
+
+            def idle(self):
+                # rien ne change tant qu'aucun evenement n'arrive
+                return False
 
             def activate(self):
                 raise NotImplementedError
@@ -49,7 +93,8 @@ class Viewer(BaseViewer):
                 self.window = pygame.display.get_surface()
                 self.area = self.window.get_rect()
                 self.displayed = False
-                self.bg = pygame.image.load(bg_path).convert()
+                self.bg_path = bg_path
+                self.bg = assets.load(bg_path)
                 self.rect = self.bg.get_rect()
 
             def activate(self):
@@ -61,39 +106,43 @@ class Viewer(BaseViewer):
                 self.window.blit(self.bg, self.rect, area)
 
             def deactivate(self):
-                pass
+                assets.release(self.bg_path)
 
         class StartingPage(_MainMenu):
 
-            def __init__(self, event_dict, text_getter):
-                bg_path = 'Images\\bg.png'
+            def __init__(self, event_dict, catalog):
+                bg_path = os.path.join('Images', 'bg.png')
                 super().__init__(event_dict, bg_path)
 
-                self.text_getter = text_getter
-                self.font = pygame.font.Font(sp_cfg['font'], sp_cfg.getint('font_size'))
+                self.catalog = catalog
+                self.font_path = sp_cfg['font']
+                self.font_size = sp_cfg.getint('font_size')
                 self.fonts = dict()
                 self.changes = set()
-                self.language = general_cfg['language']
+
+            def render_text(self, text, color):
+                # les deux etats de chaque texte sont rendus une seule fois, meme si la page est recreee
+                return text_surfaces.render(self.font_path, self.font_size, text, color)
 
             def display_text(self):
 
                 # Quit text
-                quit_text = tuple(self.text_getter((self.language,), 2))[0][-1]
-                render = self.font.render(quit_text, True, (255, 255, 255))
+                quit_text = self.catalog[2]
+                render = self.render_text(quit_text, (255, 255, 255))
                 rect = render.get_rect().move(70, 540).inflate(-4, -4)
 
-                render2 = self.font.render(quit_text, True, (180, 180, 180))
+                render2 = self.render_text(quit_text, (180, 180, 180))
                 rect2 = render2.get_rect().move(70, 540).inflate(-4, -4)
 
                 self.fonts['quit'] = [(render, rect), (render2, rect2), 0]
                 self.changes.add('quit')
 
                 # Play text
-                play_text = tuple(self.text_getter((self.language,), 1))[0][-1]
-                render = self.font.render(play_text, True, (255, 255, 255))
+                play_text = self.catalog[1]
+                render = self.render_text(play_text, (255, 255, 255))
                 rect = render.get_rect().move(70, 440).inflate(-4, -4)
 
-                render2 = self.font.render(play_text, True, (180, 180, 180))
+                render2 = self.render_text(play_text, (180, 180, 180))
                 rect2 = render2.get_rect().move(70, 440).inflate(-4, -4)
 
                 self.fonts['play'] = [(render, rect), (render2, rect2), 0]
@@ -121,92 +170,282 @@ class Viewer(BaseViewer):
                 return self.events.pop(MOUSEMOTION), self.events.pop(MOUSEBUTTONDOWN)
 
             def update(self):
+                if not self.flipped:
+                    # le fond n'a pas encore ete affiche, ou la fenetre a ete recouverte
+                    rects = None
+                    self.flipped = True
+                else:
+                    rects = list()
 
                 for font_name in self.changes:
                     font = self.fonts[font_name]
                     i = font[-1]
                     self.window.blit(font[i][0], font[i][1])
+                    if rects is not None:
+                        rects.append(font[i][1])
 
                 self.changes.clear()
+                return rects
+
+            def idle(self):
+                return self.flipped and not self.changes
 
             def activate(self):
                 super().activate()
                 self.display_text()
 
+            def deactivate(self):
+                super().deactivate()
+
+        class LoadingPage(_ViewerPage):
+
+            def __init__(self, event_dict):
+                super().__init__(event_dict)
+                self.window = pygame.display.get_surface()
+                area = self.window.get_rect()
+                self.frame = pygame.Rect(0, 0, area.width // 2, 24)
+                self.frame.center = area.centerx, area.height * 4 // 5
+                self.progress = 0.
+                self.changed = True
+
+            def set_progress(self, progress):
+                if progress != self.progress:
+                    self.progress = progress
+                    self.changed = True
+
+            def activate(self):
+                pygame.draw.rect(self.window, (40, 40, 40), self.frame)
+
+            def idle(self):
+                return self.flipped and not self.changed
+
+            def update(self):
+                if self.changed:
+                    bar = self.frame.inflate(-6, -6)
+                    bar.width = round(bar.width * self.progress)
+                    pygame.draw.rect(self.window, (255, 255, 255), bar)
+                    self.changed = False
+                elif self.flipped:
+                    return []
+                if not self.flipped:
+                    self.flipped = True
+                    return None
+                return [self.frame]
+
+            def unbind_events(self):
+                pass
+
+            def deactivate(self):
+                pass
+
         class InGame(_ViewerPage):
+            precise_pacing = True
+            BG_PATH = os.path.join('Images', 'level1_bg.png')
+            STRUCTURE_PATH = os.path.join('Images', 'platform.png')
+            PLAYER_PATH = os.path.join('Images', 'player.png')
+            ASSETS = ((BG_PATH, 'convert'), (STRUCTURE_PATH, 'convert_alpha'), (PLAYER_PATH, 'convert_alpha'))
 
-            def __init__(self, event_dict, action_set, level_id):
+            def __init__(self, event_dict, action_set, level_id, dirty_rects=None, level_cache=None, render=True):
                 super().__init__(event_dict)
                 self.level_id = int(level_id)
-                self.sprites = pygame.sprite.Group()
+                self.render = render  # sans rendu, seule la camera suit encore le joueur
+                if dirty_rects is None:
+                    dirty_rects = ig_cfg.getboolean('dirty_rects')
+                self.dirty_rects = dirty_rects
+                self.sprites = pygame.sprite.LayeredDirty() if dirty_rects else pygame.sprite.Group()
+                if level_cache is None:
+                    level_cache = ig_cfg.getboolean('level_cache')
+                self.use_level_cache = level_cache
+                self.level_cache = None
                 self.structure_group = pygame.sprite.Group()
+                self.structures = dict()
                 self.window = pygame.display.get_surface()
                 self.player_group = pygame.sprite.GroupSingle()
                 self.player = None
                 self.actions = action_set
                 self.bg = None
+                self.structure_image = None
                 self.area = self.window.get_rect()
 
-                self.a = np.zeros(2, dtype=np.int32)  # decalage additionnel dans la conversion pymunk <-> pygame
+                self.structure_index = UniformGrid()
+                self.camera = Camera(self.area, self.structure_index, ig_cfg.getfloat('camera_smoothing'))
+                self.transform = CoordinateTransform(self.area.height, self.camera.offset)
+                self.shown = set()
+                self.synced_offset = (0, 0)
+                self.log_structures = ig_cfg.getboolean('log_structure_rects')
+                self.debug_overlay = None
+                self.loaded_assets = list()
+                self.pending_rects = list()  # zones dessinees par display, presentees a la frame suivante
+
+            def load_image(self, path, mode='convert'):
+                self.loaded_assets.append((path, mode))
+                return assets.load(path, mode)
 
             def display_bg(self, label):
-                image = pygame.image.load('Images\\level1_bg.png').convert()
+                image = self.load_image(self.BG_PATH)
                 self.window.blit(image, image.get_rect())
                 self.bg = image
+                if self.dirty_rects:
+                    self.sprites.clear(self.window, self.bg)
+
+            def load_structure_image(self):
+                if self.structure_image is None:
+                    self.structure_image = self.load_image(self.STRUCTURE_PATH, 'convert_alpha')
+                return self.structure_image
+
+            def index_level(self, store):
+                # niveau charge d'un seul coup : l'index est construit directement depuis le StructureStore
+                size = self.load_structure_image().get_size()
+                self.structure_index = UniformGrid.from_structures(store, dict.fromkeys(store.labels, size))
+                self.camera.index = self.structure_index
 
             def load_structures(self, structures):
-                image = pygame.image.load('Images\\platform.png').convert_alpha()
+                image = self.load_structure_image()
+                loaded = list()
                 for structure in structures:
                     label = structure[4]
-                    print(structure)
-                    sprite = sprites.Structure(structure[2:4], image)
-                    self.sprites.add(sprite)
-                    self.structure_group.add(sprite)
+                    if self.log_structures:
+                        logger.debug('structure loaded: {}'.format(structure))
+                    loaded.append(self.add_structure(structure[0], structure[2:4], image))
+                return loaded
+
+            def unload_structures(self, structure_ids):
+                return [self.remove_structure(structure_id) for structure_id in structure_ids]
+
+            def add_structure(self, structure_id, coords, image):
+                sprite = sprites.Structure(coords, image, structure_id)
+                self.structure_group.add(sprite)
+                self.structures[structure_id] = sprite
+                if structure_id not in self.structure_index:
+                    self.structure_index.insert(structure_id, sprite.world_rect)
+                sprite.place(*self.synced_offset)
+                if self.level_cache is not None:
+                    self.level_cache.invalidate(sprite.world_rect)
+                return sprite
+
+            def remove_structure(self, structure_id):
+                sprite = self.structures.pop(structure_id)
+                self.structure_index.remove(structure_id)
+                sprite.kill()
+                self.shown.discard(sprite)
+                if self.level_cache is not None:
+                    self.level_cache.invalidate(sprite.world_rect)
+                return sprite
 
             def load_player(self, coords):
 
-                image = pygame.image.load('Images\\player.png').convert_alpha()
-                print(coords)
+                image = self.load_image(self.PLAYER_PATH, 'convert_alpha')
                 player = sprites.Player(coords, image)
                 self.sprites.add(player)
                 self.player_group.add(player)
                 self.player = player
 
             def display(self):
-                self.sprites.draw(self.window)
+                if not self.render:
+                    return
+                if self.use_level_cache:
+                    self.level_cache = ChunkCache(self.bg, self.structure_index, self.structures, self.area.height,
+                                                  ig_cfg.getint('level_cache_chunk_width'),
+                                                  ig_cfg.getint('level_cache_size') * 2 ** 20)
+                rects = self.sprites.draw(self.window)
+                if rects:
+                    self.pending_rects.extend(rects)
 
             def update(self):
-                for sprite in self.sprites.sprites():
-                    self.window.blit(sprite.image, sprite.rect)
-                # self.sprites.clear(self.window, self.bg)
-                # self.sprites.draw(self.window)
-                self.a[0] = -self.player.body.position.x + self.area.width / 2
+                if not self.render:
+                    self.camera.update()
+                    return []
+                rects = None
+                overlay = self.debug_overlay
+                if self.level_cache is not None:
+                    # quelques grands blits pre-rendus au lieu d'un blit par structure
+                    self.level_cache.draw(self.window, self.camera)
+                    self.player_group.draw(self.window)
+                else:
+                    visible = self.visible_structures()
+                    self.show_structures(visible)
+                    if self.dirty_rects:
+                        if overlay is not None and overlay.drawn:
+                            # efface le dessin precedent de l'overlay
+                            self.sprites.repaint_rect(self.area)
+                            overlay.drawn = False
+                        rects = self.sprites.draw(self.window)
+                    else:
+                        for sprite in visible:
+                            self.window.blit(sprite.image, sprite.rect)
+                        self.player_group.draw(self.window)
+                if overlay is not None and overlay.enabled:
+                    overlay.draw()
+                    rects = None
+                self.camera.update()
+                if not self.flipped:
+                    # le menu ou la barre de chargement sont encore a l'ecran
+                    self.flipped = True
+                    rects = None
+                if self.pending_rects:
+                    if rects is not None:
+                        rects = self.pending_rects + rects
+                    self.pending_rects = list()
+                return rects
+
+            def show_structures(self, visible):
+                # les structures sont statiques : leurs rects ne sont recalcules que si le decalage de la camera change
+                visible = set(visible)
+                offset = int(self.camera.offset[0]), int(self.camera.offset[1])
+                if offset != self.synced_offset:
+                    self.synced_offset = offset
+                    to_place = visible
+                else:
+                    to_place = visible - self.shown
+                for sprite in to_place:
+                    sprite.place(*offset)
+                    if self.log_structures:
+                        logger.debug('structure {} placed at {}'.format(sprite.structure_id, sprite.rect))
+
+                if self.dirty_rects:
+                    # seules les structures visibles restent dans le groupe dessine
+                    self.sprites.remove(*(self.shown - visible))
+                    self.sprites.add(*(visible - self.shown))
+                self.shown = visible
 
             def bind_events(self, event_handler):
                 self.events[KEYDOWN] = event_handler.keydown
                 self.events[KEYUP] = event_handler.keyup
 
+            def unbind_events(self):
+                return self.events.pop(KEYDOWN, None), self.events.pop(KEYUP, None)
+
+            def visible_structures(self):
+                return [self.structures[i] for i in self.camera.visible()]
+
+            def colliding_structures(self, rect):
+                # rect est en coordonnees de la fenetre, l'index en coordonnees du niveau
+                rect = rect.move(-int(self.camera.offset[0]), -int(self.camera.offset[1]))
+                return [self.structures[i] for i in self.structure_index.query_rect(rect)]
+
             def is_player_on_ground(self):
-                return pygame.sprite.spritecollideany(
-                    self.player.bottom_rect.move(self.player.vector / 10),
-                    self.structure_group,
-                    collided=self.collide)
+                # bande de 5 pixels sous les pieds du joueur
+                rect = self.player.rect
+                margin = rect.width * 8 // 25
+                feet = pygame.Rect(rect.left + margin, rect.bottom, rect.width - 2 * margin, 5)
+                structures = self.colliding_structures(feet)
+                return structures[0] if structures else None
 
             def refresh_structures(self):
-                self.structure_group.draw(self.window)
-
-            @staticmethod
-            def collide(rect, sprite):
-                return rect.colliderect(sprite.rect)
+                for sprite in self.visible_structures():
+                    self.window.blit(sprite.image, sprite.rect)
 
             def to_pygame(self, p):
-                return np.array(pymunk.pygame_util.to_pygame(p, self.window)) + self.a
+                return self.transform.to_pygame(p)
 
             def from_pygame(self, p):
-                return np.array(pymunk.pygame_util.to_pygame(p, self.window)) - self.a
+                return self.transform.from_pygame(p)
 
             def activate(self):
                 pass
 
             def deactivate(self):
-                pass
+                for path, mode in self.loaded_assets:
+                    assets.release(path, mode)
+                self.loaded_assets.clear()
+                self.structure_image = None
@@ -0,0 +1,29 @@
+# -*- coding:Utf-8 -*-
+
+import sys
+import os
+
+from Classes.level_file import export_level
+from Classes.model import Model
+
+
+def main():
+    base = os.environ.get('BASE')
+    if base is not None:
+        os.chdir(base)
+
+    if len(sys.argv) >= 2 and (sys.argv[1] == '-h' or sys.argv[1] == '--help'):
+        return 'Tap "compile_levels" to compile every level or "compile_levels <level-id> ..." to compile some of them.'
+
+    model = Model()
+    if len(sys.argv) >= 2:
+        level_ids = [int(arg) for arg in sys.argv[1:]]
+    else:
+        level_ids = [row[0] for row in model.execute('SELECT id FROM LevelBaseInfo')]
+
+    paths = [export_level(model, level_id) for level_id in level_ids]
+    return '\n'.join('Level {} has been compiled to "{}".'.format(*item) for item in zip(level_ids, paths))
+
+
+if __name__ == "__main__":
+    print(main())
@@ -1,9 +1,11 @@
 # -*- coding:Utf-8 -*-
 
+import os
 from configparser import ConfigParser
 
 cfg = ConfigParser()
-cfg.read('data\\config.ini')
+cfg.read(os.path.join('data', 'config.ini'))
 
 general_cfg = cfg['General configuration']
 sp_cfg = cfg['Starting page configuration']
+ig_cfg = cfg['In game configuration']
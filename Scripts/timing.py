@@ -0,0 +1,19 @@
+# -*- coding:Utf-8 -*-
+
+import time
+
+
+def timeit(func, loop):
+    times = list()
+    tt1 = time.process_time()
+    for _ in range(loop):
+        t1 = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - t1)
+    tt2 = time.process_time()
+
+    mint, maxt = min(times), max(times)
+    mean = sum(times) / len(times)
+    tt = tt2 - tt1
+    print(f'''min : {mint}, max : {maxt},
+'mean : {mean}, total time : {tt}''')
@@ -6,13 +6,23 @@ import sys
 from pygame.constants import FULLSCREEN
 
 from Classes.controller import Controller
+from Classes.localization import Catalog
 from Classes.model import Model
+from Classes.profiler import FrameProfiler
+from Classes.replay import InputRecorder, InputReplay
 from Classes.viewer import Viewer
 from Scripts.configurations import general_cfg
 from Scripts.logger import logger
 
 parser = argparse.ArgumentParser()
 parser.add_argument('--debug', action="store_true")
+parser.add_argument('--headless', action="store_true", help='run a level without window nor framerate limit')
+parser.add_argument('--level', type=int, default=1, help='level run in headless mode')
+parser.add_argument('--frames', type=int, default=6000, help='number of frames run in headless mode')
+parser.add_argument('--record', metavar='PATH', help='record the inputs of the game in PATH')
+parser.add_argument('--replay', metavar='PATH', help='replay the inputs recorded in PATH')
+parser.add_argument('--profile', metavar='PATH', help='time each phase of every frame and save the timings in PATH')
+parser.add_argument('--profile-frames', type=int, default=4096, help='number of frames kept by the profiler')
 args = parser.parse_args()
 
 DEBUG = args.debug
@@ -20,13 +30,33 @@ if not DEBUG:
     DEBUG = general_cfg.getboolean('debug_mode')
 
 
+def profiler():
+    if args.profile is None:
+        return None
+    return FrameProfiler(args.profile_frames, path=args.profile)
+
+
+def headless():
+    from Classes.headless import run
+
+    logger.info('Launching Platformer in headless mode')
+    run(args.level, args.frames, profiler=profiler())
+    return 0
+
+
 def main():
+    if args.headless:
+        return headless()
     if DEBUG:
         logger.info('Launching Platformer in debug mode')
     else:
         logger.info('Launching Platformer')
     model = Model()
-    viewer = Viewer(model.get_text, framerate=60)
+    if general_cfg.getboolean('text_cache'):
+        catalog = Catalog.load(model, general_cfg['language'])
+    else:
+        catalog = Catalog.from_model(model, general_cfg['language'])
+    viewer = Viewer(catalog, framerate=60)
     controller = Controller(model, viewer)
 
     flags = tuple() if DEBUG else (FULLSCREEN,)
@@ -34,7 +64,20 @@ def main():
                     general_cfg.getint('resolution_y')),
                     flags)
     controller.init_pages()
-    return viewer.loop()
+
+    recorder = None
+    if args.record:
+        recorder = InputRecorder()
+        viewer.record(recorder)
+    if args.replay:
+        viewer.play_back(InputReplay(args.replay))
+    viewer.profiler = profiler()
+
+    status = viewer.loop()
+    if recorder is not None:
+        recorder.save(args.record, viewer.FRAMERATE, viewer.frame_index)
+        logger.info('{} inputs recorded in "{}"'.format(len(recorder.records), args.record))
+    return status
 
 
 if __name__ == '__main__':
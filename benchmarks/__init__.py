@@ -0,0 +1,67 @@
+# -*- coding:Utf-8 -*-
+
+import json
+import logging
+import os
+import platform
+import time
+
+import numpy as np
+
+# les benchmarks n'ouvrent jamais de vraie fenetre
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from Scripts.logger import logger
+
+# les messages du jeu ne vont ni dans platformer.log ni dans la sortie des mesures, sauf les avertissements
+for handler in tuple(logger.handlers):
+    logger.removeHandler(handler)
+    handler.close()
+warnings = logging.StreamHandler()
+warnings.setLevel(logging.WARNING)
+logger.addHandler(warnings)
+
+results = dict()  # nom de la mesure -> statistiques en ms, rempli par report
+
+
+def measure(func, loop):
+    times = np.empty(loop, dtype=np.float64)
+    for i in range(loop):
+        t1 = time.perf_counter()
+        func()
+        times[i] = time.perf_counter() - t1
+    return times
+
+
+def report(name, times):
+    p50, p95 = np.percentile(times, (50, 95)) * 1000
+    results[name] = {'mean': times.mean() * 1000, 'p50': p50, 'p95': p95, 'runs': len(times)}
+    print('{:<52} mean : {:8.4f} ms, p50 : {:8.4f} ms, p95 : {:8.4f} ms'.format(name, times.mean() * 1000, p50, p95))
+
+
+def save_results(path, suites):
+    # suites: module de benchmark -> {nom de la mesure -> statistiques}
+    document = {'python': platform.python_version(), 'machine': platform.machine(),
+                'system': platform.system(), 'date': time.strftime('%Y-%m-%d %H:%M:%S'), 'results': suites}
+    with open(path, 'w') as file:
+        json.dump(document, file, indent=1, sort_keys=True)
+    return path
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def compare(suites, baseline, threshold=.25, statistic='p50'):
+    # renvoie (suite, nom, reference, mesure, rapport, regression) pour chaque mesure presente des deux cotes
+    rows = list()
+    for suite, measures in suites.items():
+        for name, stats in measures.items():
+            reference = baseline.get(suite, dict()).get(name)
+            if reference is None or not reference[statistic]:
+                continue
+            ratio = stats[statistic] / reference[statistic]
+            rows.append((suite, name, reference[statistic], stats[statistic], ratio, ratio > 1 + threshold))
+    return rows
@@ -0,0 +1,64 @@
+# -*- coding:Utf-8 -*-
+
+import argparse
+import importlib
+import os
+import sys
+
+import benchmarks
+
+SUITES = ('physics', 'geometry', 'streaming', 'rendering', 'sprites', 'transforms', 'spatial_index', 'events', 'text',
+          'queues', 'model', 'level_file', 'level_load')
+DIRECTORY = os.path.dirname(__file__)
+RESULTS_PATH = os.path.join(DIRECTORY, 'results.json')
+BASELINE_PATH = os.path.join(DIRECTORY, 'baseline.json')  # propre a chaque machine, jamais versionnee
+
+parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                 epilog='Timings depend on the machine: the baseline is stored per machine, in '
+                                        'benchmarks/baseline.json by default, and is not versioned.')
+parser.add_argument('suites', nargs='*', metavar='suite', help='benchmarks to run, all of them by default: ' +
+                    ', '.join(SUITES))
+parser.add_argument('--output', default=RESULTS_PATH, help='JSON file receiving the results')
+parser.add_argument('--baseline', default=BASELINE_PATH, help='JSON results the new ones are compared with')
+parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+parser.add_argument('--threshold', type=float, default=.25,
+                    help='relative slowdown of the median reported as a regression')
+
+
+def run(names):
+    suites = dict()
+    for name in names:
+        print('--------- {} ---------'.format(name))
+        benchmarks.results.clear()
+        importlib.import_module('benchmarks.' + name).main()
+        suites[name] = dict(benchmarks.results)
+    return suites
+
+
+def main():
+    args = parser.parse_args()
+    unknown = [name for name in args.suites if name not in SUITES]
+    if unknown:
+        parser.error('unknown benchmarks: ' + ', '.join(unknown))
+
+    suites = run(args.suites or SUITES)
+    print('results saved in "{}"'.format(benchmarks.save_results(args.output, suites)))
+    if args.save_baseline:
+        print('baseline saved in "{}"'.format(benchmarks.save_results(args.baseline, suites)))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print('no baseline to compare with on this machine, run with --save-baseline to store one')
+        return 0
+    rows = benchmarks.compare(suites, benchmarks.load_results(args.baseline), args.threshold)
+    print('--------- comparison with "{}" (p50) ---------'.format(args.baseline))
+    for suite, name, reference, value, ratio, regression in rows:
+        print('{:<11}{:<72} {:9.4f} ms -> {:9.4f} ms ({:+.0%})'.format('REGRESSION ' if regression else '',
+                                                                     suite + ': ' + name, reference, value, ratio - 1))
+    regressions = sum(row[-1] for row in rows)
+    print('{} regressions out of {} measures'.format(regressions, len(rows)))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+# -*- coding:Utf-8 -*-
+
+import pygame
+from pygame.constants import KEYDOWN, MOUSEMOTION, QUIT, USEREVENT
+
+import benchmarks
+from Classes.events import EventTable, coalesce_mouse_motion
+
+WINDOW_SIZE = (1280, 720)
+BURST = 200  # evenements recus pendant une frame
+LOOP = 300
+
+
+def post_burst():
+    for i in range(BURST // 2):
+        pygame.event.post(pygame.event.Event(MOUSEMOTION, pos=(i, i), rel=(1, 1), buttons=(0, 0, 0)))
+        pygame.event.post(pygame.event.Event(USEREVENT + 1, index=i))  # aucun evenement de ce type n'est lie
+
+
+def main():
+    pygame.display.set_mode(WINDOW_SIZE)
+    fonts = {'quit': pygame.Rect(70, 540, 200, 60), 'play': pygame.Rect(70, 440, 200, 60)}
+
+    def mouse_motion(event):
+        # comme StartingPage.EventHandler.mouse_motion, un test de collision par texte
+        for rect in fonts.values():
+            rect.collidepoint(event.pos)
+
+    def dict_dispatch():
+        # ancienne boucle de BaseViewer : tout arrive dans la file, recherche dans le dict pour chaque evenement
+        post_burst()
+        for event in pygame.event.get():
+            if event.type in events.keys():
+                events[event.type](event)
+        pygame.event.pump()
+
+    def table_dispatch():
+        post_burst()
+        handlers = table.handlers
+        for event in coalesce_mouse_motion(pygame.event.get()):
+            handler = handlers[event.type]
+            if handler is not None:
+                handler(event)
+
+    pygame.event.set_allowed(None)
+    benchmarks.report('{} events per frame, post only'.format(BURST), benchmarks.measure(post_burst, LOOP))
+    pygame.event.clear()
+
+    events = {MOUSEMOTION: mouse_motion, KEYDOWN: mouse_motion}
+    benchmarks.report('{} events per frame, dict dispatch'.format(BURST), benchmarks.measure(dict_dispatch, LOOP))
+
+    table = EventTable((QUIT,))
+    table.update(events)
+    table.apply()
+    benchmarks.report('{} events per frame, filtered, coalesced, table dispatch'.format(BURST),
+                      benchmarks.measure(table_dispatch, LOOP))
+    pygame.event.set_allowed(None)
+
+
+if __name__ == '__main__':
+    main()
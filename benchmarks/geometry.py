@@ -0,0 +1,63 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+import pymunk
+
+import benchmarks
+from benchmarks.streaming import PLATFORM_WIDTH
+from benchmarks.synthetic import LEVEL_HEIGHT
+from Classes.geometry import merge_segments
+
+RUNS = 2000
+PLATFORMS_PER_RUN = 10
+BODIES = 200
+LOOP = 300
+DT = 1. / 300
+
+
+def tiled_segments(runs, platforms_per_run, seed=0):
+    # des rangees de plateformes posees bord a bord, separees par des trous
+    rng = np.random.default_rng(seed)
+    run_width = PLATFORM_WIDTH * platforms_per_run
+    ys = rng.integers(LEVEL_HEIGHT // 4, LEVEL_HEIGHT - 50, runs).tolist()
+    segments = list()
+    for run, y in enumerate(ys):
+        x0 = run * (run_width + 2 * PLATFORM_WIDTH)
+        for i in range(platforms_per_run):
+            x = x0 + i * PLATFORM_WIDTH
+            segments.append((len(segments) + 1, (x, y), (x + PLATFORM_WIDTH, y)))
+    return segments
+
+
+def build_space(shapes_ends, starts):
+    space = pymunk.Space()
+    space.gravity = 0, -1000
+    static = pymunk.Body(body_type=pymunk.Body.STATIC)
+    space.add(static, [pymunk.Segment(static, a, b, 5) for a, b in shapes_ends])
+    # des boites qui glissent sur les rangees et passent d'une plateforme a l'autre
+    for x, y in starts:
+        body = pymunk.Body(1.3, pymunk.moment_for_box(1.3, (40, 40)))
+        body.position = x + 20, y + 30
+        body.velocity = 200, 0
+        space.add(body, pymunk.Poly.create_box(body, (40, 40)))
+    return space
+
+
+def main():
+    segments = tiled_segments(RUNS, PLATFORMS_PER_RUN)
+    name = '{} segments'.format(len(segments))
+    benchmarks.report(name + ', merge_segments', benchmarks.measure(lambda: merge_segments(segments), 5))
+
+    merged = merge_segments(segments)
+    starts = [segments[i * PLATFORMS_PER_RUN][1] for i in range(0, RUNS, RUNS // BODIES)]
+    for label, ends in (('separate shapes', [(a, b) for _, a, b in segments]),
+                        ('{} merged shapes'.format(len(merged)), [(a, b) for a, b, _ in merged])):
+        space = build_space(ends, starts)
+        for _ in range(10):
+            space.step(DT)
+        benchmarks.report('{}, {} bodies, {}'.format(name, BODIES, label),
+                          benchmarks.measure(lambda: space.step(DT), LOOP))
+
+
+if __name__ == '__main__':
+    main()
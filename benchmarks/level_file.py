@@ -0,0 +1,39 @@
+# -*- coding:Utf-8 -*-
+
+import os
+import tempfile
+
+import benchmarks
+from benchmarks.synthetic import create_database
+from Classes.level_file import export_level, level_path, load_level
+from Classes.model import Model
+
+LEVELS = 10
+STRUCTURES_PER_LEVEL = 100000
+LOOP = 5
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = create_database(os.path.join(directory, 'data.db'), LEVELS, STRUCTURES_PER_LEVEL)
+        levels_directory = os.path.join(directory, 'levels')
+        name = 'level of {} structures'.format(STRUCTURES_PER_LEVEL)
+
+        model = Model(path, levels_directory)  # migration et index avant la compilation
+        benchmarks.report(name + ', SQLite structure_getter',
+                          benchmarks.measure(lambda: model.structure_getter(LEVELS), LOOP))
+
+        export_level(model, LEVELS, levels_directory)
+        compiled = level_path(LEVELS, levels_directory)
+        os.utime(compiled, (os.path.getmtime(path) + 1,) * 2)
+        benchmarks.report(name + ', load_level (memmap)',
+                          benchmarks.measure(lambda: load_level(compiled), LOOP))
+        benchmarks.report(name + ', compiled structure_getter',
+                          benchmarks.measure(lambda: model.structure_getter(LEVELS), LOOP))
+        benchmarks.report(name + ', compiled get_level',
+                          benchmarks.measure(lambda: model.get_level(LEVELS), LOOP))
+        model.database_connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# -*- coding:Utf-8 -*-
+
+import os
+import tempfile
+
+import benchmarks
+from benchmarks.synthetic import create_database
+from Classes.controller import Controller
+from Classes.headless import HeadlessViewer
+from Classes.model import Model
+
+WINDOW_SIZE = (1280, 720)
+COUNTS = (100, 1000, 10000)
+LOOP = 3
+
+
+def load_level(database_path, level_id):
+    # du fichier de la base a un niveau pret a jouer, sans le thread de chargement ni le rendu
+    model = Model(database_path)
+    viewer = HeadlessViewer()
+    viewer.wdisplay(WINDOW_SIZE)
+    controller = Controller(model, viewer)
+    viewer.play(level_id)
+    controller.page_handler.add_page('InGame', model, viewer, level_id)
+    controller.page_handler.current_page.deactivate()
+    viewer.page_handler.current_page.deactivate()
+    model.database_connection.close()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        for level_id, count in enumerate(COUNTS, 1):
+            path = create_database(os.path.join(directory, 'data{}.db'.format(level_id)), 1, count)
+            Model(path).database_connection.close()  # migration hors mesure
+            benchmarks.report('level of {} structures, load and activate'.format(count),
+                              benchmarks.measure(lambda: load_level(path, 1), LOOP))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# -*- coding:Utf-8 -*-
+
+import os
+import sqlite3
+import tempfile
+
+import benchmarks
+from benchmarks.synthetic import create_database
+from Classes.model import Model
+
+LEVELS = 10
+STRUCTURES_PER_LEVEL = 100000
+LOOP = 5
+
+# ancienne requete de Model.get_structures
+JOIN_QUERY = '''SELECT id, level_id, pos_x, pos_y, label
+        FROM LevelStructures JOIN StructureType on LevelStructures.type = StructureType.structure_id
+        WHERE level_id = ?'''
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = create_database(os.path.join(directory, 'data.db'), LEVELS, STRUCTURES_PER_LEVEL)
+        name = '{} structures, level of {}'.format(LEVELS * STRUCTURES_PER_LEVEL, STRUCTURES_PER_LEVEL)
+
+        connection = sqlite3.connect(path)
+        benchmarks.report(name + ', JOIN without index',
+                          benchmarks.measure(lambda: tuple(connection.execute(JOIN_QUERY, (LEVELS,))), LOOP))
+        connection.close()
+
+        model = Model(path)  # applique la migration qui cree l'index
+        benchmarks.report(name + ', structure_getter',
+                          benchmarks.measure(lambda: model.structure_getter(LEVELS), LOOP))
+        benchmarks.report(name + ', get_structures_array',
+                          benchmarks.measure(lambda: model.get_structures_array(LEVELS), LOOP))
+        model.database_connection.close()
+
+
+if __name__ == '__main__':
+    main()
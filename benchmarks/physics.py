@@ -0,0 +1,54 @@
+# -*- coding:Utf-8 -*-
+
+import pymunk
+
+import benchmarks
+from benchmarks.streaming import PLATFORM_WIDTH, build_store
+from benchmarks.synthetic import LEVEL_HEIGHT
+from Classes.physics import LevelMetrics, SpaceFactory
+
+STRUCTURES = 20000
+BODIES = (1, 200, 5000)
+LOOP = 300
+DT = 1. / 300
+
+CONFIGURATIONS = (
+    ('bb_tree', SpaceFactory(broadphase='bb_tree')),
+    ('spatial_hash', SpaceFactory(broadphase='spatial_hash')),
+    ('bb_tree, 5 iterations', SpaceFactory(broadphase='bb_tree', iterations=5)),
+    ('bb_tree, sleeping after .5 s', SpaceFactory(broadphase='bb_tree', sleep_time_threshold=.5)),
+    ('bb_tree, collision slop 0.5', SpaceFactory(broadphase='bb_tree', collision_slop=.5)),
+)
+
+
+def build_space(factory, store, metrics, bodies):
+    space = factory.create(metrics)
+    static = pymunk.Body(body_type=pymunk.Body.STATIC)
+    space.add(static, [pymunk.Segment(static, (x, LEVEL_HEIGHT - y), (x + PLATFORM_WIDTH, LEVEL_HEIGHT - y), 5)
+                       for _, _, x, y, _ in store])
+    # des boites qui tombent sur les plateformes tout au long du niveau
+    for i in range(bodies):
+        body = pymunk.Body(1.3, pymunk.moment_for_box(1.3, (40, 40)))
+        body.position = i * metrics.width / bodies, LEVEL_HEIGHT
+        shape = pymunk.Poly.create_box(body, (40, 40))
+        shape.friction = 1
+        space.add(body, shape)
+    return space
+
+
+def main():
+    store = build_store(STRUCTURES)
+    for bodies in BODIES:
+        metrics = LevelMetrics.from_structures(store, {0: (PLATFORM_WIDTH, 50), 1: (PLATFORM_WIDTH, 50)},
+                                               bodies=bodies)
+        print(metrics, SpaceFactory.spatial_hash_args(metrics))
+        for name, factory in CONFIGURATIONS:
+            space = build_space(factory, store, metrics, bodies)
+            for _ in range(LOOP):  # les boites se posent avant la mesure
+                space.step(DT)
+            benchmarks.report('{} structures, {} bodies, {}'.format(STRUCTURES, bodies, name),
+                              benchmarks.measure(lambda: space.step(DT), LOOP))
+
+
+if __name__ == '__main__':
+    main()
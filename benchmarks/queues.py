@@ -0,0 +1,58 @@
+# -*- coding:Utf-8 -*-
+
+import benchmarks
+from Classes.my_queue import DequeQueue, PriorityQueue
+from Classes.ordered_set import OrderedSet
+
+COUNT = 1000
+LOOP = 300
+
+
+def main():
+    name = '{} elements, '.format(COUNT)
+
+    def priority_queue():
+        queue = PriorityQueue(COUNT + 1)
+        for i in range(COUNT):
+            queue.put(i, i, sort=False)
+        for _ in range(COUNT):
+            queue.get()
+
+    def priority_queue_update():
+        queue = PriorityQueue(COUNT + 1)
+        queue.update({i: i for i in range(COUNT)})
+        list(queue.get_all())
+
+    benchmarks.report(name + 'PriorityQueue put and get', benchmarks.measure(priority_queue, LOOP))
+    benchmarks.report(name + 'PriorityQueue update and get_all', benchmarks.measure(priority_queue_update, LOOP))
+
+    def deque_queue():
+        queue = DequeQueue()
+        for i in range(COUNT):
+            queue.put(i)
+        for _ in range(COUNT):
+            queue.get()
+
+    def deque_queue_elements():
+        queue = DequeQueue(range(COUNT))
+        list(queue.elements())
+
+    benchmarks.report(name + 'DequeQueue put and get', benchmarks.measure(deque_queue, LOOP))
+    benchmarks.report(name + 'DequeQueue elements', benchmarks.measure(deque_queue_elements, LOOP))
+
+    def ordered_set():
+        elements = OrderedSet()
+        for i in range(COUNT):
+            elements.add(i)
+        for i in range(0, COUNT, 2):
+            elements.add(i)  # deplace a la fin
+        for i in range(COUNT):
+            elements.remove(i)
+
+    benchmarks.report(name + 'OrderedSet add, move and remove', benchmarks.measure(ordered_set, LOOP))
+    elements = OrderedSet(range(COUNT))
+    benchmarks.report(name + 'OrderedSet iteration', benchmarks.measure(lambda: list(elements), LOOP))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding:Utf-8 -*-
+
+import math
+
+import pygame
+
+import benchmarks
+from Classes.viewer import Viewer
+import sprites.sprites as sprites
+
+WINDOW_SIZE = (1280, 720)
+FRAMES = 300
+MODES = {
+    'full flip': dict(dirty_rects=False, level_cache=False),
+    'dirty rects': dict(dirty_rects=True, level_cache=False),
+    'level cache': dict(dirty_rects=False, level_cache=True),
+}
+
+
+def build_page(mode, structure_count):
+    page = Viewer.ViewerPageHandler.InGame(dict(), set(), 1, **MODES[mode])
+
+    bg = pygame.Surface(WINDOW_SIZE).convert()
+    bg.fill((90, 140, 200))
+    page.window.blit(bg, bg.get_rect())
+    page.bg = bg
+    if page.dirty_rects:
+        page.sprites.clear(page.window, bg)
+
+    image = pygame.Surface((183, 44), pygame.SRCALPHA).convert_alpha()
+    image.fill((120, 80, 40, 255))
+    # le niveau est assez long pour contenir environ 20 plateformes par ecran
+    for i in range(structure_count):
+        page.add_structure(i, (i % 20 * 64 + i // 20 * WINDOW_SIZE[0], 200 + i % 7 * 60), image)
+
+    player_image = pygame.Surface((50, 80), pygame.SRCALPHA).convert_alpha()
+    player_image.fill((0, 0, 0, 255))
+    player = sprites.Player((600, 300), player_image)
+    page.sprites.add(player)
+    page.player_group.add(player)
+    page.player = player
+    player.init_body(page.to_pygame, page.from_pygame, page.transform.place_rect, 1.3, 40000)
+    page.camera.follow(player)
+    page.display()
+    return page
+
+
+def frame_function(page, scrolling):
+    frame = 0
+
+    def frame_():
+        nonlocal frame
+        frame += 1
+        x = page.player.body.position.x + (7 if scrolling else 0)
+        # le joueur saute sur place, ou court vers la droite quand la camera defile
+        page.player.body.position = x, 300 + 100 * math.sin(frame / 10)
+        page.player_group.update()
+        rects = page.update()
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    return frame_
+
+
+def main():
+    pygame.display.set_mode(WINDOW_SIZE)
+    for scrolling in (False, True):
+        for structure_count in (10, 100, 1000, 10000):
+            for mode in MODES:
+                page = build_page(mode, structure_count)
+                times = benchmarks.measure(frame_function(page, scrolling), FRAMES)
+                name = '{}{} structures, {}'.format('scrolling, ' if scrolling else '', structure_count, mode)
+                benchmarks.report(name, times)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+from pygame import Rect
+
+import benchmarks
+from Classes.model import STRUCTURE_DTYPE, Model
+from Classes.spatial_index import UniformGrid
+
+PLATFORM_SIZE = (183, 44)
+VIEW = Rect(0, 0, 1280, 720)
+QUERIES = 2000
+
+
+def synthetic_structures(count, seed=0):
+    # environ 20 plateformes par ecran, le niveau s'allonge vers la droite avec le nombre de structures
+    rng = np.random.default_rng(seed)
+    length = max(count // 20, 1) * VIEW.width
+    array = np.zeros(count, dtype=STRUCTURE_DTYPE)
+    array['id'] = np.arange(1, count + 1)
+    array['x'] = rng.integers(0, length, count)
+    array['y'] = rng.integers(0, VIEW.height, count)
+    return Model.StructureStore(1, array, {0: 'platform'}), length
+
+
+def main():
+    rng = np.random.default_rng(1)
+    for count in (10, 100, 1000, 10000, 100000):
+        store, length = synthetic_structures(count)
+        grid = UniformGrid.from_structures(store, {0: PLATFORM_SIZE})
+        rects = [Rect(s[2:4], PLATFORM_SIZE) for s in store]
+
+        views = [VIEW.move(int(x), 0) for x in rng.integers(0, length, QUERIES)]
+        points = [(int(x), int(y)) for x, y in zip(rng.integers(0, length, QUERIES),
+                                                    rng.integers(0, VIEW.height, QUERIES))]
+        views_iter, points_iter, linear_iter = iter(views * 2), iter(points * 2), iter(views * 2)
+
+        benchmarks.report('{} structures, grid rect query'.format(count),
+                          benchmarks.measure(lambda: grid.query_rect(next(views_iter)), QUERIES))
+        benchmarks.report('{} structures, grid point query'.format(count),
+                          benchmarks.measure(lambda: grid.query_point(next(points_iter)), QUERIES))
+        benchmarks.report('{} structures, linear rect query'.format(count),
+                          benchmarks.measure(lambda: next(linear_iter).collidelistall(rects), QUERIES))
+
+
+if __name__ == '__main__':
+    main()
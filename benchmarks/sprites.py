@@ -0,0 +1,53 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+import pygame
+from pymunk.vec2d import Vec2d
+
+import benchmarks
+from Classes.transform import CoordinateTransform
+import sprites.sprites as sprites
+
+WINDOW_SIZE = (1280, 720)
+COUNTS = (100, 1000)
+LOOP = 300
+
+
+def main():
+    window = pygame.display.set_mode(WINDOW_SIZE)
+    transform = CoordinateTransform(WINDOW_SIZE[1], np.zeros(2, dtype=np.int32))
+    rng = np.random.default_rng(0)
+
+    player_image = pygame.Surface((50, 80), pygame.SRCALPHA).convert_alpha()
+    player_image.fill((0, 0, 0, 255))
+    structure_image = pygame.Surface((183, 44), pygame.SRCALPHA).convert_alpha()
+    structure_image.fill((120, 80, 40, 255))
+
+    for count in COUNTS:
+        positions = rng.integers(0, WINDOW_SIZE, (count, 2)).tolist()
+
+        players = pygame.sprite.Group()
+        for x, y in positions:
+            player = sprites.Player((x, y), player_image)
+            player.init_body(transform.to_pygame, transform.from_pygame, transform.place_rect, 1.3, 40000)
+            player.previous_position = player.body.position - Vec2d(3, 3)
+            players.add(player)
+        benchmarks.report('{} players, Group.update (interpolation)'.format(count),
+                          benchmarks.measure(lambda: players.update(.5), LOOP))
+        benchmarks.report('{} players, Group.draw'.format(count),
+                          benchmarks.measure(lambda: players.draw(window), LOOP))
+
+        structures = pygame.sprite.Group(sprites.Structure((x, y), structure_image, i)
+                                         for i, (x, y) in enumerate(positions))
+
+        def place():
+            for structure in structures:
+                structure.place(-7, 0)
+
+        benchmarks.report('{} structures, Structure.place'.format(count), benchmarks.measure(place, LOOP))
+        benchmarks.report('{} structures, Group.draw'.format(count),
+                          benchmarks.measure(lambda: structures.draw(window), LOOP))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+import pymunk
+
+import benchmarks
+from benchmarks.synthetic import LEVEL_HEIGHT, structure_rows
+from Classes.model import STRUCTURE_DTYPE, Model
+from Classes.streaming import LevelStreamer
+
+STRUCTURES = 100000
+PLATFORM_WIDTH = 170
+LOOP = 300
+DT = 1. / 300
+
+
+def build_store(count):
+    rows = [(i, x, y, kind) for i, (level_id, x, y, kind) in enumerate(structure_rows(1, count), 1)]
+    array = np.array(rows, dtype=STRUCTURE_DTYPE)
+    return Model.StructureStore(1, array, {0: 'platform', 1: 'platform'})
+
+
+def build_space():
+    space = pymunk.Space()
+    space.gravity = 0, -1000
+    static = pymunk.Body(body_type=pymunk.Body.STATIC)
+    body = pymunk.Body(1.3, pymunk.moment_for_box(1.3, (40, 40)))
+    body.position = 0, LEVEL_HEIGHT
+    space.add(static, body, pymunk.Poly.create_box(body, (40, 40)))
+    return space, static, body
+
+
+def main():
+    store = build_store(STRUCTURES)
+
+    def add_all():
+        space.add([pymunk.Segment(static, (x, LEVEL_HEIGHT - y), (x + PLATFORM_WIDTH, LEVEL_HEIGHT - y), 5)
+                   for _, _, x, y, _ in store])
+
+    space, static, body = build_space()
+    benchmarks.report('{} structures, shapes created at activation'.format(STRUCTURES),
+                      benchmarks.measure(add_all, 1))
+    benchmarks.report('{} structures, every shape in the space'.format(STRUCTURES),
+                      benchmarks.measure(lambda: space.step(DT), LOOP))
+
+    space, static, body = build_space()
+    shapes = dict()
+
+    def load(rows):
+        for structure_id, _, x, y, _ in rows:
+            shapes[structure_id] = pymunk.Segment(static, (x, LEVEL_HEIGHT - y),
+                                                  (x + PLATFORM_WIDTH, LEVEL_HEIGHT - y), 5)
+        space.add([shapes[row[0]] for row in rows])
+
+    def unload(structure_ids):
+        space.remove([shapes.pop(structure_id) for structure_id in structure_ids])
+
+    streamer = LevelStreamer(store, load, unload)
+    benchmarks.report('{} structures, streamed shapes created at activation'.format(STRUCTURES),
+                      benchmarks.measure(lambda: streamer.update(body.position.x), 1))
+    benchmarks.report('{} structures, streamed ({} loaded)'.format(STRUCTURES, len(streamer)),
+                      benchmarks.measure(lambda: space.step(DT), LOOP))
+
+    positions = iter(range(0, 1024 * LOOP, 1024))
+    benchmarks.report('streamer.update, one new chunk per call',
+                      benchmarks.measure(lambda: streamer.update(next(positions)), LOOP))
+
+
+if __name__ == '__main__':
+    main()
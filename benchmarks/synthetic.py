@@ -0,0 +1,40 @@
+# -*- coding:Utf-8 -*-
+
+import shutil
+import sqlite3
+
+import numpy as np
+
+from Classes.model import DATABASE_PATH
+
+LEVEL_HEIGHT = 720
+STRUCTURES_PER_SCREEN = 20
+SCREEN_WIDTH = 1280
+
+
+def structure_rows(level_id, count, seed=0):
+    # environ 20 plateformes par ecran, le niveau s'allonge vers la droite avec le nombre de structures
+    rng = np.random.default_rng(seed + level_id)
+    length = max(count // STRUCTURES_PER_SCREEN, 1) * SCREEN_WIDTH
+    xs = rng.integers(0, length, count)
+    ys = rng.integers(LEVEL_HEIGHT // 4, LEVEL_HEIGHT - 50, count)
+    types = rng.integers(0, 2, count)
+    return zip([level_id] * count, xs.tolist(), ys.tolist(), types.tolist())
+
+
+def create_database(path, levels=1, structures_per_level=1000, seed=0):
+    # copie de la vraie base (schema et tables de reference) dont les niveaux sont remplaces
+    shutil.copyfile(DATABASE_PATH, path)
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute('DROP INDEX IF EXISTS LevelStructures_level')
+        connection.execute('PRAGMA user_version = 0')
+        connection.execute('DELETE FROM LevelStructures')
+        connection.execute('DELETE FROM LevelBaseInfo')
+        connection.executemany('INSERT INTO LevelBaseInfo (id, base_pos_x, base_pos_y, bg_id) VALUES (?, 4, 5, 1)',
+                               [(level_id,) for level_id in range(1, levels + 1)])
+        for level_id in range(1, levels + 1):
+            connection.executemany('INSERT INTO LevelStructures (level_id, pos_x, pos_y, type) VALUES (?, ?, ?, ?)',
+                                   structure_rows(level_id, structures_per_level, seed))
+    connection.close()
+    return path
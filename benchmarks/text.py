@@ -0,0 +1,69 @@
+# -*- coding:Utf-8 -*-
+
+import pygame
+
+import benchmarks
+from Classes.text_surfaces import TextSurfaceCache
+from Scripts.configurations import sp_cfg
+
+WINDOW_SIZE = (1280, 720)
+LOOP = 300
+LABELS = ('Jouer', 'Quitter', 'Options', 'Niveau 1')
+HUD_SIZE = 24
+
+
+def main():
+    pygame.font.init()
+    window = pygame.display.set_mode(WINDOW_SIZE)
+    path, size = sp_cfg['font'], sp_cfg.getint('font_size')
+    font = pygame.font.Font(path, size)
+    hud_font = pygame.font.Font(path, HUD_SIZE)
+    cache = TextSurfaceCache()
+
+    def labels_render():
+        # ancien StartingPage.display_text : deux rendus par texte
+        for label in LABELS:
+            font.render(label, True, (255, 255, 255))
+            font.render(label, True, (180, 180, 180))
+
+    def labels_cached():
+        for label in LABELS:
+            cache.render(path, size, label, (255, 255, 255))
+            cache.render(path, size, label, (180, 180, 180))
+
+    benchmarks.report('{} menu labels, font.render'.format(len(LABELS)), benchmarks.measure(labels_render, LOOP))
+    benchmarks.report('{} menu labels, TextSurfaceCache.render'.format(len(LABELS)),
+                      benchmarks.measure(labels_cached, LOOP))
+
+    fps = [0]
+
+    def fps_render():
+        # valeurs repetees d'une frame a l'autre, comme les fps
+        fps[0] = (fps[0] + 1) % 8
+        window.blit(hud_font.render(str(58 + fps[0]), True, (255, 255, 0)), (8, 8))
+
+    def fps_cached():
+        fps[0] = (fps[0] + 1) % 8
+        cache.draw_number(window, (8, 8), path, HUD_SIZE, 58 + fps[0], (255, 255, 0))
+
+    benchmarks.report('FPS counter, font.render every frame', benchmarks.measure(fps_render, LOOP))
+    benchmarks.report('FPS counter, TextSurfaceCache.draw_number', benchmarks.measure(fps_cached, LOOP))
+
+    score = [10 ** 7]
+
+    def score_render():
+        # une valeur differente a chaque frame
+        score[0] += 37
+        window.blit(hud_font.render(str(score[0]), True, (255, 255, 0)), (8, 8))
+
+    def score_digits():
+        score[0] += 37
+        cache.draw_number(window, (8, 8), path, HUD_SIZE, score[0], (255, 255, 0))
+
+    benchmarks.report('8 digit counter, font.render every frame', benchmarks.measure(score_render, LOOP))
+    benchmarks.report('8 digit counter, cached digit glyphs', benchmarks.measure(score_digits, LOOP))
+    print('text surfaces kept after the counters: {}'.format(len(cache)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# -*- coding:Utf-8 -*-
+
+import numpy as np
+import pygame
+import pymunk.pygame_util
+from pymunk.vec2d import Vec2d
+
+import benchmarks
+from Classes.transform import CoordinateTransform
+
+WINDOW_SIZE = (1280, 720)
+COUNT = 1000
+LOOP = 300
+
+
+def main():
+    window = pygame.display.set_mode(WINDOW_SIZE)
+    offset = np.array((-350, 0), dtype=np.int32)
+    transform = CoordinateTransform(WINDOW_SIZE[1], offset)
+
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(-5000, 5000, (COUNT, 2))
+    vectors = [Vec2d(x, y) for x, y in positions]
+
+    def numpy_per_call():
+        # ancienne conversion de InGame.to_pygame
+        for p in vectors:
+            np.array(pymunk.pygame_util.to_pygame(p, window)) + offset
+
+    def transform_per_call():
+        to_pygame = transform.to_pygame
+        for p in vectors:
+            to_pygame(p)
+
+    rects = [pygame.Rect(0, 0, 50, 80) for _ in vectors]
+
+    def transform_in_place():
+        # Player.update : le rect est deplace sans tuple intermediaire
+        place_rect = transform.place_rect
+        for rect, p in zip(rects, vectors):
+            place_rect(rect, p)
+
+    def transform_then_assign():
+        to_pygame = transform.to_pygame
+        for rect, p in zip(rects, vectors):
+            rect.topleft = to_pygame(p)
+
+    assert all(transform.to_pygame(p) == tuple(np.array(pymunk.pygame_util.to_pygame(p, window)) + offset)
+               for p in vectors)
+
+    for name, func in (('numpy array per call', numpy_per_call),
+                       ('CoordinateTransform.to_pygame', transform_per_call),
+                       ('rect.topleft = CoordinateTransform.to_pygame(p)', transform_then_assign),
+                       ('CoordinateTransform.place_rect', transform_in_place)):
+        benchmarks.report('{} positions, {}'.format(COUNT, name), benchmarks.measure(func, LOOP))
+
+
+if __name__ == '__main__':
+    main()
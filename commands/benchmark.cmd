@@ -0,0 +1,4 @@
+@echo off
+pushd "%base%"
+python -m benchmarks %*
+popd
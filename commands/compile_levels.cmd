@@ -0,0 +1,2 @@
+@echo off
+python "%base%\Scripts\compile_levels.py" %*
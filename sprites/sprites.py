@@ -3,7 +3,7 @@
 import numpy as np
 from numpy import cos, sin
 from pygame import Rect
-from pygame.sprite import Sprite
+from pygame.sprite import DirtySprite
 import pymunk
 from math import pi
 from pymunk.vec2d import Vec2d
@@ -11,7 +11,7 @@ from pymunk.vec2d import Vec2d
 D45 = pi / 4
 
 
-class BaseSprite(Sprite):
+class BaseSprite(DirtySprite):
 
     def __init__(self, coords, image):
         super().__init__()
@@ -24,30 +24,34 @@ class Structure(BaseSprite):
     body = pymunk.Body(body_type=pymunk.Body.STATIC)
     body.position = 0, 0
 
-    def __init__(self, coords, image):
+    def __init__(self, coords, image, structure_id=None):
         super().__init__(coords, image)
 
+        self.structure_id = structure_id
+        self.world_rect = self.rect.copy()  # position dans le niveau, sans le decalage de la camera
         self.radius = self.rect.width
 
         self.to_pygame = self.from_pygame = self.shape = self.a = self.b = None
 
-    def init_body(self, to_pygame_callback, from_pygame_callback, a, b, thickness=5, iswall=False):
+    def init_body(self, to_pygame_callback, from_pygame_callback, a, b, thickness=5, iswall=False, shape=None):
         self.from_pygame = from_pygame_callback
         self.to_pygame = to_pygame_callback
 
-        self.shape = pymunk.Segment(type(self).body, a, b, thickness)
-        self.shape.friction = 1
-        if iswall:
-            self.shape.iswall = True
+        if shape is not None:
+            # segment fusionne, partage avec les structures voisines
+            self.shape = shape
+        else:
+            self.shape = pymunk.Segment(type(self).body, a, b, thickness)
+            self.shape.friction = 1
+            if iswall:
+                self.shape.iswall = True
         self.a = self.to_pygame(a)
         self.b = self.to_pygame(b)
 
-    def update(self):
-        self.coords = self.to_pygame(self.body.position)
-        self.rect.x, self.rect.y = self.coords
-        print(self.rect)
-        # - Vec2d(
-        # self.rect.width / 2, self.rect.height - self.radius)
+    def place(self, dx, dy):
+        self.rect.x = self.world_rect.x + dx
+        self.rect.y = self.world_rect.y + dy
+        self.dirty = 1
 
 
 class Player0(BaseSprite):
@@ -69,6 +73,8 @@ class Player0(BaseSprite):
 
 
 class Player(BaseSprite):
+    _layer = 1
+
     def __init__(self, coords, image):
         super().__init__(coords, image)
         self.image = image
@@ -83,12 +89,15 @@ class Player(BaseSprite):
         self.direction = 1
 
         self.to_pygame = self.from_pygame = self.mass = self.radius = self.points = self.moment = self.body = None
-        self.shape = self.VELOCITY = None
+        self.place_rect = self.shape = self.VELOCITY = None
+        self.previous_position = None
+        self.position = [0., 0.]  # position interpolee, mise a jour sur place a chaque frame
 
-    def init_body(self, to_pygame_callback, from_pygame_callback, mass, velocity):
+    def init_body(self, to_pygame_callback, from_pygame_callback, place_rect_callback, mass, velocity):
         
         self.to_pygame = to_pygame_callback
         self.from_pygame = from_pygame_callback
+        self.place_rect = place_rect_callback
         
         self.mass = mass  # 1.3
         self.radius = self.rect.width / 2
@@ -99,6 +108,8 @@ class Player(BaseSprite):
         self.moment = pymunk.moment_for_poly(self.mass, self.points)
         self.body = pymunk.Body(mass=self.mass, moment=self.moment)
         self.body.position = self.from_pygame(self.coords)
+        self.previous_position = self.body.position
+        self.position[:] = self.previous_position
         
         self.shape = pymunk.Poly(self.body, self.points)
         self.shape.friction = 0
@@ -108,14 +119,17 @@ class Player(BaseSprite):
         space.add(self.body, self.shape)
         return self.shape
     
-    def update(self):
-        self.coords = self.to_pygame(self.body.position)
+    def update(self, alpha=1.):
+        # position interpolee entre les deux derniers pas de la simulation
+        previous, current, position = self.previous_position, self.body.position, self.position
+        position[0] = previous[0] + (current[0] - previous[0]) * alpha
+        position[1] = previous[1] + (current[1] - previous[1]) * alpha
         if abs(self.body.angle) > D45:
             if self.body.angle < 0:
                 self.body.angle += D45 * 2
             else:
                 self.body.angle -= D45 * 2
                  
-        self.rect.x, self.rect.y = self.coords - Vec2d(
-            self.rect.width / 2, self.rect.height - self.radius)
+        self.place_rect(self.rect, position, -(self.rect.width // 2), int(self.radius) - self.rect.height)
+        self.dirty = 1
 